@@ -323,6 +323,12 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY environment variable is not set")
 
+# Compressed transcripts fetched for snippet generation, cached on local disk (see cms/views/transcript_cache.py)
+TRANSCRIPT_CACHE_DIR = os.getenv('TRANSCRIPT_CACHE_DIR', os.path.join(BASE_DIR, 'transcript_cache'))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv('TRANSCRIPT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# How long (seconds) a cached auto-generated transcript is served without checking for newly uploaded manual subtitles
+TRANSCRIPT_CACHE_MANUAL_CHECK_TTL = int(os.getenv('TRANSCRIPT_CACHE_MANUAL_CHECK_TTL', 7 * 24 * 60 * 60))
+
 # Email configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -339,6 +345,26 @@ if not EMAIL_HOST_USER or not EMAIL_HOST_PASSWORD:
 FRONTEND_PASSWORD_RESET_URL = os.getenv('FRONTEND_PASSWORD_RESET_URL', 'http://localhost:5173/reset-password')
 
 
+# Cache
+# Database-backed, so that every gunicorn worker (and both frontends, which share the db)
+# see the same entries and invalidations. Create the table with `python manage.py createcachetable`.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'snipvocab_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+    # Per-process, in front of the db cache for hot read-only pages (e.g. video share pages),
+    # so that traffic spikes don't turn into db queries. Entries here must have short timeouts,
+    # since invalidations only reach the process that made them.
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'snipvocab_local',
+    },
+}
+
 # CACHE_MIDDLEWARE_SECONDS = 60 * 15  # 15 minutes (DISABLED)
 # CACHE_MIDDLEWARE_KEY_PREFIX = 'snipvocab' (DISABLED)
 
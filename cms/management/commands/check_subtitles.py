@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from shared.models import Video, VideoStatus
+from cms.views import SubtitleChecker
+
+
+class Command(BaseCommand):
+    help = "Check the available subtitle languages of all unchecked videos, many at a time and rate limited"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frontend', help="Only check the videos of this frontend")
+        parser.add_argument('--concurrency', type=int, default=8, help="Checks running at the same time")
+        parser.add_argument('--rate', type=float, default=5.0, help="At most this many requests per second")
+        parser.add_argument('--max-retries', type=int, default=4, help="Retries per video, with exponential backoff")
+        parser.add_argument('--chunk-size', type=int, default=200, help="Videos written per bulk_update")
+        parser.add_argument('--limit', type=int, help="Check at most this many videos")
+
+    def handle(self, *args, **options):
+        videos = Video.objects.filter(checked_for_relevant_subtitles=False).exclude(
+            status=VideoStatus.NOT_RELEVANT
+        ).only('id', 'youtube_id').order_by('id')
+        if options['frontend']:
+            videos = videos.filter(frontend=options['frontend'])
+        if options['limit']:
+            videos = videos[:options['limit']]
+
+        checker = SubtitleChecker(
+            concurrency=max(options['concurrency'], 1),
+            rate=options['rate'],
+            burst=max(options['concurrency'], 1),
+            max_retries=options['max_retries'],
+        )
+        stats = checker.check(
+            videos,
+            chunk_size=options['chunk_size'],
+            progress=lambda checked, failed: self.stdout.write(f"Checked {checked} videos, {failed} failed..."),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {stats['checked']} videos; {stats['failed']} failed and stay unchecked"
+        ))
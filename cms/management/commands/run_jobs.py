@@ -0,0 +1,40 @@
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from cms.views import run_job_worker, run_review_subtitle_prefetcher
+
+
+class Command(BaseCommand):
+    help = "Work off the queued CMS batch jobs (snippets, translations, metadata, subtitle checks) and prefetch the review queue's subtitles"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help="Number of items worked on at the same time")
+        parser.add_argument('--poll-interval', type=float, default=5, help="Seconds to wait when the queue is empty")
+        parser.add_argument('--until-idle', action='store_true', help="Exit once no item is left instead of polling")
+        parser.add_argument('--no-subtitle-prefetch', action='store_true', help="Don't probe the subtitles ahead of the review queue")
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            # running items are finished, nothing new is claimed
+            self.stdout.write("Stopping after the running items...")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+        if not options['until_idle'] and not options['no_subtitle_prefetch']:
+            threading.Thread(
+                target=run_review_subtitle_prefetcher,
+                kwargs={'stop': stop, 'log': self.stdout.write},
+                name='review-subtitle-prefetcher',
+                daemon=True,
+            ).start()
+        run_job_worker(
+            concurrency=max(options['concurrency'], 1),
+            poll_interval=options['poll_interval'],
+            until_idle=options['until_idle'],
+            stop=stop,
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS("Job worker stopped"))
@@ -0,0 +1,55 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
+from shared.models import Video
+
+
+class JobKind(models.TextChoices):
+    GENERATE_SNIPPETS = 'generate_snippets', 'Generate Snippets'
+    GENERATE_TRANSLATIONS = 'generate_translations', 'Generate Translations'
+    ENRICH_VIDEO_METADATA = 'enrich_video_metadata', 'Enrich Video Metadata'
+    CHECK_SUBTITLES = 'check_subtitles', 'Check Subtitles'
+
+
+class JobItemStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    RUNNING = 'running', 'Running'
+    DONE = 'done', 'Done'
+    SKIPPED = 'skipped', 'Skipped'
+    FAILED = 'failed', 'Failed'
+
+
+class Job(models.Model):
+    """A CMS batch action, enqueued by its view and worked off item by item by the run_jobs command"""
+    kind = models.CharField(max_length=50, choices=JobKind.choices)
+    frontend = models.CharField(max_length=10)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.id} {self.get_kind_display()} ({self.frontend})"
+
+
+class JobItem(models.Model):
+    """One video of a Job; retried with backoff until max_attempts, see cms.views.job_queue"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="items")
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name="job_items")
+    status = models.CharField(max_length=20, choices=JobItemStatus.choices, default=JobItemStatus.PENDING)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    # pending items are not claimed before run_after (retry backoff)
+    run_after = models.DateTimeField(default=timezone.now)
+    # a running item whose worker died is claimed again once locked_until has passed
+    locked_until = models.DateTimeField(null=True, blank=True)
+    # what the handler reported, or the last error
+    result = models.TextField(blank=True, default='')
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # workers claim by (status, run_after)
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.job} - {self.video.youtube_id}: {self.status}"
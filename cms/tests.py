@@ -1,3 +1,388 @@
-from django.test import TestCase
+import asyncio
+import re
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from shared.models import Video
+from cms.models import JobItem, JobItemStatus, JobKind
+from cms.views.fetch_video_transcript import fetch_video_transcript
+from cms.views.job_queue import (
+    JobItemSkipped, _handlers, claim_job_item, enqueue_video_job, job_handler, run_job_item, run_next_job_item,
+)
+from cms.views.transcript_cache import TranscriptSegment, evict_transcripts, get_cached_transcript_keys, store_transcript
+from cms.views.translate_snippets import (
+    AsyncTokenBucket, BatchWordEntryResponse, OpenAIVocabProvider, WordEntry, batch_snippets, translate_snippets,
+)
 
-# Create your tests here.
+
+class FakeVocabProvider:
+    """Every word of a snippet is a vocab entry, after a simulated request latency;
+    the first `failures` requests raise right away, and snippets whose text is in `omit` are left out of the first response (or all)"""
+    creation_method = "fake"
+
+    def __init__(self, latency:float=0.0, failures:int=0, omit=(), omit_always:bool=False):
+        self.latency = latency
+        self.failures = failures
+        self.omit = set(omit)
+        self.omit_always = omit_always
+        self.requests = []
+        self.in_flight = 0
+        self.in_flight_at_close = None
+
+    async def extract_vocab(self, frontend:str, texts:dict[int, str]) -> dict[int, list[WordEntry]]:
+        self.requests.append(dict(texts))
+        if len(self.requests) <= self.failures:
+            raise RuntimeError("request failed")
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency)
+            words = {
+                number: [WordEntry(word=word, translation=f"<{word}>") for word in re.findall(r'\w+', text)]
+                for number, text in texts.items() if text not in self.omit
+            }
+            if not self.omit_always:
+                self.omit = set()
+            return words
+        finally:
+            self.in_flight -= 1
+
+    async def close(self):
+        self.in_flight_at_close = self.in_flight
+
+
+def make_snippets(*contents):
+    return [SimpleNamespace(id=index, content=content) for index, content in enumerate(contents, 1)]
+
+
+def run_translate(snippets, provider, **options):
+    options = {'requests_per_second': 1000, **options}
+    with mock.patch('cms.views.translate_snippets.RETRY_BACKOFF', 0):
+        return translate_snippets(snippets, 'de', provider=provider, **options)
+
+
+class BatchSnippetsTests(SimpleTestCase):
+    def test_packs_consecutive_snippets_up_to_the_batch_size(self):
+        snippets = make_snippets(*['a'] * 7)
+        self.assertEqual([[snippet.id for snippet in batch] for batch in batch_snippets(snippets, 3, 100)], [[1, 2, 3], [4, 5, 6], [7]])
+
+    def test_starts_a_new_batch_before_max_chars(self):
+        snippets = make_snippets('x' * 4, 'x' * 4, 'x' * 3, 'x' * 1)
+        self.assertEqual([[snippet.id for snippet in batch] for batch in batch_snippets(snippets, 10, 8)], [[1, 2], [3, 4]])
+
+    def test_a_snippet_longer_than_max_chars_gets_its_own_batch(self):
+        snippets = make_snippets('x', 'x' * 20, 'x')
+        self.assertEqual([[snippet.id for snippet in batch] for batch in batch_snippets(snippets, 10, 8)], [[1], [2], [3]])
+
+    def test_no_snippets_no_batches(self):
+        self.assertEqual(batch_snippets([], 10, 8), [])
+
+
+class TranslateSnippetsTests(SimpleTestCase):
+    def test_returns_the_words_of_every_snippet(self):
+        provider = FakeVocabProvider()
+        words = run_translate(make_snippets('eins zwei', 'drei', 'vier'), provider, batch_size=2)
+        self.assertEqual({snippet_id: [entry.word for entry in entries] for snippet_id, entries in words.items()},
+                         {1: ['eins', 'zwei'], 2: ['drei'], 3: ['vier']})
+        self.assertEqual(len(provider.requests), 2)
+
+    def test_retries_failed_requests(self):
+        provider = FakeVocabProvider(failures=2)
+        words = run_translate(make_snippets('eins'), provider, max_attempts=3)
+        self.assertEqual([entry.word for entry in words[1]], ['eins'])
+        self.assertEqual(provider.requests, [{1: 'eins'}] * 3)
+
+    def test_raises_once_the_attempts_are_used_up(self):
+        provider = FakeVocabProvider(failures=2)
+        with self.assertRaisesMessage(RuntimeError, "request failed"):
+            run_translate(make_snippets('eins'), provider, max_attempts=2)
+        self.assertEqual(len(provider.requests), 2)
+
+    def test_requests_left_out_snippets_once_more(self):
+        provider = FakeVocabProvider(omit={'zwei'})
+        words = run_translate(make_snippets('eins', 'zwei', 'drei'), provider)
+        self.assertEqual(provider.requests, [{1: 'eins', 2: 'zwei', 3: 'drei'}, {2: 'zwei'}])
+        self.assertEqual([entry.word for entry in words[2]], ['zwei'])
+
+    def test_snippets_left_out_twice_have_no_words(self):
+        provider = FakeVocabProvider(omit={'zwei'}, omit_always=True)
+        words = run_translate(make_snippets('eins', 'zwei'), provider)
+        self.assertEqual(len(provider.requests), 2)
+        self.assertEqual(words[2], [])
+
+    def test_closes_the_provider_after_cancelling_the_other_batches(self):
+        provider = FakeVocabProvider(latency=0.05, failures=1)
+        with self.assertRaises(RuntimeError):
+            run_translate(make_snippets('eins', 'zwei', 'drei'), provider, batch_size=1, max_attempts=1)
+        self.assertEqual(provider.in_flight_at_close, 0)
+
+    def test_takes_rate_limit_tokens_only_for_requests_that_can_start(self):
+        provider = FakeVocabProvider(latency=0.05)
+        started = []
+        acquire = AsyncTokenBucket.acquire
+
+        async def record_acquire(bucket):
+            await acquire(bucket)
+            started.append(provider.in_flight)
+
+        with mock.patch('cms.views.translate_snippets.AsyncTokenBucket.acquire', record_acquire):
+            run_translate(make_snippets(*['eins'] * 6), provider, batch_size=1, max_concurrency=2)
+        self.assertEqual(len(started), 6)
+        self.assertLessEqual(max(started), 1)
+
+
+class OpenAIVocabProviderTests(SimpleTestCase):
+    def test_returns_the_words_per_snippet_number(self):
+        parsed = BatchWordEntryResponse(snippets=[
+            {'snippet': 1, 'words': [{'word': 'eins', 'translation': 'one'}]},
+            {'snippet': 1, 'words': [{'word': 'zwei', 'translation': 'two'}]},
+            {'snippet': 7, 'words': [{'word': 'sieben', 'translation': 'seven'}]},
+        ])
+        client = mock.MagicMock()
+        client.beta.chat.completions.parse = mock.AsyncMock(
+            return_value=SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))])
+        )
+        client.close = mock.AsyncMock()
+        with mock.patch('cms.views.translate_snippets.AsyncOpenAI', return_value=client) as client_factory:
+            words = run_translate(make_snippets('eins zwei', 'drei'), OpenAIVocabProvider())
+        client_factory.assert_called_once()
+        # snippet 2 was left out, so it was requested once more; the unknown number 7 is dropped
+        self.assertEqual(client.beta.chat.completions.parse.await_count, 2)
+        self.assertEqual({snippet_id: [entry.word for entry in entries] for snippet_id, entries in words.items()},
+                         {1: ['eins', 'zwei'], 2: []})
+        client.close.assert_awaited_once()
+
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        handlers = mock.patch.dict(_handlers)
+        handlers.start()
+        self.addCleanup(handlers.stop)
+        self.outcomes = []
+
+        @job_handler('test')
+        def handle(video):
+            outcome = self.outcomes.pop(0) if self.outcomes else 'done'
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.videos = [Video.objects.create(youtube_id=f'video{index}') for index in range(2)]
+
+    def make_due(self, item):
+        JobItem.objects.filter(id=item.id).update(run_after=timezone.now())
+
+    def test_enqueue_skips_videos_already_queued_for_the_kind(self):
+        job = enqueue_video_job('test', 'de', Video.objects.filter(id=self.videos[0].id))
+        self.assertEqual(job.items.count(), 1)
+        second_job = enqueue_video_job('test', 'de', Video.objects.all())
+        self.assertEqual(list(second_job.items.values_list('video_id', flat=True)), [self.videos[1].id])
+        self.assertIsNone(enqueue_video_job('test', 'de', self.videos))
+
+    def test_two_workers_claim_different_items(self):
+        enqueue_video_job('test', 'de', self.videos)
+        first = claim_job_item()
+        second = claim_job_item()
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual({first.status, second.status}, {JobItemStatus.RUNNING})
+        self.assertEqual((first.attempts, second.attempts), (1, 1))
+        self.assertIsNone(claim_job_item())
+
+    def test_an_expired_lease_is_claimed_again(self):
+        enqueue_video_job('test', 'de', self.videos[:1])
+        stale = claim_job_item()
+        self.assertIsNone(claim_job_item())
+        JobItem.objects.filter(id=stale.id).update(locked_until=timezone.now() - timezone.timedelta(seconds=1))
+        reclaimed = claim_job_item()
+        self.assertEqual((reclaimed.id, reclaimed.attempts), (stale.id, 2))
+        # the first worker finishing late doesn't overwrite the running attempt
+        self.outcomes = ['late', 'on time']
+        run_job_item(stale)
+        self.assertEqual(JobItem.objects.get(id=stale.id).status, JobItemStatus.RUNNING)
+        run_job_item(reclaimed)
+        item = JobItem.objects.get(id=stale.id)
+        self.assertEqual((item.status, item.result), (JobItemStatus.DONE, 'on time'))
+
+    def test_failing_items_are_retried_with_backoff_until_failed(self):
+        job = enqueue_video_job('test', 'de', self.videos[:1], max_attempts=3)
+        self.outcomes = [RuntimeError('first'), RuntimeError('second'), RuntimeError('third')]
+        backoffs = []
+        for attempt in range(1, 3):
+            started = timezone.now()
+            item = claim_job_item()
+            self.assertEqual(run_job_item(item), JobItemStatus.PENDING)
+            item.refresh_from_db()
+            backoffs.append(item.run_after - started)
+            # not claimed again before its backoff is over
+            self.assertIsNone(claim_job_item())
+            self.make_due(item)
+        self.assertGreater(backoffs[1], backoffs[0])
+        self.assertTrue(run_next_job_item())
+        item = job.items.get()
+        self.assertEqual((item.status, item.attempts, item.result), (JobItemStatus.FAILED, 3, 'RuntimeError: third'))
+        self.assertFalse(run_next_job_item())
+
+    def test_skipped_items_are_not_retried(self):
+        job = enqueue_video_job('test', 'de', self.videos[:1])
+        self.outcomes = [JobItemSkipped('has no subtitles')]
+        self.assertTrue(run_next_job_item())
+        item = job.items.get()
+        self.assertEqual((item.status, item.attempts, item.result), (JobItemStatus.SKIPPED, 1, 'has no subtitles'))
+        self.assertIsNotNone(item.finished_at)
+        self.assertFalse(run_next_job_item())
+
+
+class CheckSubtitlesJobTests(TestCase):
+    class FlakyListingClient:
+        def __init__(self, failing):
+            self.failing = set(failing)
+            self.calls = []
+
+        def list_transcripts(self, youtube_id):
+            self.calls.append(youtube_id)
+            if youtube_id in self.failing:
+                self.failing.remove(youtube_id)
+                raise ConnectionError('blocked')
+            return [SimpleNamespace(language_code='de')]
+
+    def setUp(self):
+        self.videos = [Video.objects.create(youtube_id=f'video{index}') for index in range(3)]
+        self.client = self.FlakyListingClient(failing=['video1'])
+        patcher = mock.patch('cms.views.bulk_check_subtitles.job_subtitle_checker.client', self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_claimed_items_are_checked_together_and_failures_retried_by_the_queue(self):
+        job = enqueue_video_job(JobKind.CHECK_SUBTITLES, 'de', self.videos)
+        with mock.patch.object(Video.objects, 'bulk_update', wraps=Video.objects.bulk_update) as bulk_update:
+            self.assertTrue(run_next_job_item())
+        bulk_update.assert_called_once()
+        # the checker doesn't retry under the queue, each video is listed once
+        self.assertEqual(sorted(self.client.calls), ['video0', 'video1', 'video2'])
+        items = {item.video.youtube_id: item for item in job.items.select_related('video')}
+        self.assertEqual(items['video0'].status, JobItemStatus.DONE)
+        self.assertEqual(items['video0'].result, 'Languages: de')
+        self.assertTrue(items['video2'].video.checked_for_relevant_subtitles)
+        self.assertEqual(items['video1'].status, JobItemStatus.PENDING)
+        self.assertFalse(items['video1'].video.checked_for_relevant_subtitles)
+
+        JobItem.objects.filter(id=items['video1'].id).update(run_after=timezone.now())
+        self.assertTrue(run_next_job_item())
+        item = JobItem.objects.select_related('video').get(id=items['video1'].id)
+        self.assertEqual((item.status, item.attempts), (JobItemStatus.DONE, 2))
+        self.assertTrue(item.video.checked_for_relevant_subtitles)
+        self.assertFalse(run_next_job_item())
+
+    def test_a_batch_takes_items_of_one_job_only(self):
+        first_job = enqueue_video_job(JobKind.CHECK_SUBTITLES, 'de', self.videos[:2])
+        enqueue_video_job(JobKind.CHECK_SUBTITLES, 'de', self.videos[2:])
+        self.client.failing.clear()
+        self.assertTrue(run_next_job_item())
+        self.assertEqual(first_job.items.filter(status=JobItemStatus.DONE).count(), 2)
+        self.assertEqual(JobItem.objects.filter(status=JobItemStatus.PENDING).count(), 1)
+
+
+class FakeTranscript:
+    def __init__(self, language_code, is_generated, text):
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.text = text
+        self.fetched = False
+
+    def fetch(self):
+        self.fetched = True
+        return [TranscriptSegment(self.text, 0.0, 1.0)]
+
+
+class FakeTranscriptClient:
+    def __init__(self, *transcripts):
+        self.transcripts = transcripts
+        self.list_calls = 0
+
+    def list_transcripts(self, youtube_id):
+        self.list_calls += 1
+        return self.transcripts
+
+
+class FetchVideoTranscriptTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings = override_settings(TRANSCRIPT_CACHE_DIR=cache_dir.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.video = Video.objects.create(youtube_id='video', frontend='de')
+
+    def test_cached_manual_transcripts_are_read_without_listing(self):
+        store_transcript('video', 'de', False, [TranscriptSegment('cached manual', 0.0, 1.0)])
+        client = FakeTranscriptClient()
+        transcript = fetch_video_transcript(self.video, client)
+        self.assertEqual((transcript.is_generated, transcript.segments[0].text), (False, 'cached manual'))
+        self.assertEqual(client.list_calls, 0)
+
+    def test_manual_transcripts_uploaded_later_replace_a_cached_generated_one(self):
+        store_transcript('video', 'de', True, [TranscriptSegment('cached generated', 0.0, 1.0)])
+        manual = FakeTranscript('de', False, 'new manual')
+        client = FakeTranscriptClient(FakeTranscript('de', True, 'generated'), manual)
+        transcript = fetch_video_transcript(self.video, client)
+        self.assertEqual((transcript.is_generated, transcript.segments[0].text), (False, 'new manual'))
+        self.assertTrue(manual.fetched)
+        # and it's cached from now on
+        self.assertEqual(fetch_video_transcript(self.video, client).segments[0].text, 'new manual')
+        self.assertEqual(client.list_calls, 1)
+
+    def test_cached_generated_transcripts_are_served_once_there_is_no_manual_one(self):
+        store_transcript('video', 'de', True, [TranscriptSegment('cached generated', 0.0, 1.0)])
+        generated = FakeTranscript('de', True, 'generated')
+        client = FakeTranscriptClient(FakeTranscript('en', False, 'english'), generated)
+        transcript = fetch_video_transcript(self.video, client)
+        self.assertEqual((transcript.is_generated, transcript.segments[0].text), (True, 'cached generated'))
+        self.assertFalse(generated.fetched)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.available_subtitle_languages, ['en', 'de'])
+        # the listing showed no manual transcript, so the next regeneration needs no network calls
+        self.assertEqual(fetch_video_transcript(self.video, client).segments[0].text, 'cached generated')
+        self.assertEqual(client.list_calls, 1)
+
+    def test_cached_generated_transcripts_are_checked_again_after_the_ttl(self):
+        store_transcript('video', 'de', True, [TranscriptSegment('cached generated', 0.0, 1.0)])
+        client = FakeTranscriptClient(FakeTranscript('de', True, 'generated'))
+        fetch_video_transcript(self.video, client)
+        with override_settings(TRANSCRIPT_CACHE_MANUAL_CHECK_TTL=0):
+            fetch_video_transcript(self.video, client)
+        self.assertEqual(client.list_calls, 2)
+
+    def test_refresh_lists_the_transcripts_again(self):
+        store_transcript('video', 'de', True, [TranscriptSegment('cached generated', 0.0, 1.0)])
+        client = FakeTranscriptClient(FakeTranscript('de', True, 'generated'))
+        fetch_video_transcript(self.video, client)
+        client.transcripts = (FakeTranscript('de', False, 'new manual'),)
+        self.assertEqual(fetch_video_transcript(self.video, client, refresh=True).segments[0].text, 'new manual')
+        self.assertEqual(client.list_calls, 2)
+
+
+class TranscriptCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings = override_settings(TRANSCRIPT_CACHE_DIR=cache_dir.name, TRANSCRIPT_CACHE_MAX_BYTES=3000)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def store(self, youtube_id):
+        # about 1.3 kB compressed
+        store_transcript(youtube_id, 'de', True, [TranscriptSegment(f'{youtube_id} {index}', float(index), 1.0) for index in range(300)])
+
+    def test_scans_only_when_the_tracked_size_goes_over_the_limit(self):
+        with mock.patch('cms.views.transcript_cache.evict_transcripts', wraps=evict_transcripts) as evict:
+            self.store('first')
+            # the first write of a process scans, to learn the size
+            self.assertEqual(evict.call_count, 1)
+            self.store('second')
+            self.assertEqual(evict.call_count, 1)
+            self.store('third')
+            self.assertEqual(evict.call_count, 2)
+        self.assertEqual(get_cached_transcript_keys('first'), [])
+        self.assertEqual(get_cached_transcript_keys('third'), [('de', True)])
@@ -6,30 +6,38 @@ from .bulk_import_videos import bulk_import_videos
 from .cms_home import cms_home
 from .enrich_video_metadata import enrich_video_metadata
 from .export_snippets_csv import export_snippets_csv
+from .fetch_video_transcript import fetch_video_transcript, NoTranscriptAvailable
 from .generate_snippets import generate_snippets
 from .generate_snippets_for_all_shortlisted import generate_snippets_for_all_shortlisted
-from .generate_translations import generate_translations
+from .generate_translations import generate_translations, generate_video_translations
 from .generate_translations_for_all_snippets import generate_translations_for_all_snippets
 from .get_current_frontend import get_current_frontend
 from .import_channel_videos import import_channel_videos
 from .import_playlist_videos import import_playlist_videos
+from .job_queue import job_handler, enqueue_video_job, get_recent_jobs, run_job_worker, JobItemSkipped
 from .list_all_videos import list_all_videos
 from .manage_tags import manage_tags
 from .mark_videos_without_relevant_subtitles import mark_videos_without_relevant_subtitles
+from .notify_videos_changed import notify_videos_changed
 from .publish_video import publish_video
 from .publish_videos_with_many_snippets import publish_videos_with_many_snippets
 from .reduce_review_priorities import reduce_review_priorities
 from .remove_tag import remove_tag
 from .reset_snippets import reset_snippets
+from .review_subtitle_prefetcher import prefetch_review_subtitles, run_review_subtitle_prefetcher
 from .review_videos import review_videos
 from .search_videos import search_videos
 from .set_frontend import set_frontend
+from .subtitle_checker import SubtitleChecker, TokenBucket
 from .tag_autocomplete import tag_autocomplete
+from .tag_prefix_index import get_tag_suggestions, invalidate_tag_prefix_index
+from .translate_snippets import translate_snippets, OpenAIVocabProvider
 from .update_video_priorities import update_video_priorities
 from .update_video_status import update_video_status
 from .update_video_statuses import update_video_statuses
 from .user_statistics import user_statistics
 from .video_details import video_details
+from .video_status_counts import get_video_status_counts, invalidate_video_status_counts
 
 __all__ = [
     'actions',
@@ -38,27 +46,46 @@ __all__ = [
     'bulk_check_subtitles',
     'bulk_import_videos',
     'cms_home',
+    'enqueue_video_job',
     'enrich_video_metadata',
     'export_snippets_csv',
+    'fetch_video_transcript',
     'generate_snippets',
     'generate_snippets_for_all_shortlisted',
     'generate_translations',
     'generate_translations_for_all_snippets',
+    'generate_video_translations',
     'get_current_frontend',
+    'get_recent_jobs',
+    'get_tag_suggestions',
+    'get_video_status_counts',
     'import_channel_videos',
     'import_playlist_videos',
+    'invalidate_tag_prefix_index',
+    'invalidate_video_status_counts',
+    'job_handler',
+    'JobItemSkipped',
     'list_all_videos',
     'manage_tags',
     'mark_videos_without_relevant_subtitles',
+    'NoTranscriptAvailable',
+    'OpenAIVocabProvider',
+    'notify_videos_changed',
     'publish_video',
+    'prefetch_review_subtitles',
     'publish_videos_with_many_snippets',
     'reduce_review_priorities',
     'remove_tag',
     'reset_snippets',
     'review_videos',
+    'run_job_worker',
+    'run_review_subtitle_prefetcher',
     'search_videos',
     'set_frontend',
+    'SubtitleChecker',
     'tag_autocomplete',
+    'TokenBucket',
+    'translate_snippets',
     'update_video_priorities',
     'update_video_status',
     'update_video_statuses',
@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
 from shared.models import Video, VideoStatus
 from .get_current_frontend import get_current_frontend
+from .job_queue import get_recent_jobs
 
 @staff_member_required
 def actions(request):
@@ -15,6 +16,7 @@ def actions(request):
     ).count()
     context = {
         'unchecked_count': unchecked_count,
+        'recent_jobs': get_recent_jobs(frontend),
         'frontend': frontend
     }
     return render(request, 'actions.html', context)
@@ -3,6 +3,8 @@ from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_http_methods
 from shared.models import Video, Tag, TagType
+from .tag_prefix_index import invalidate_tag_prefix_index
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -24,6 +26,8 @@ def add_tag(request, youtube_id):
         
         # Add the tag to the video
         video.tags.add(tag)
+        notify_videos_changed([video])
+        invalidate_tag_prefix_index()
         
         if created:
             messages.success(request, f"Created and added new tag '{tag.name}' to video.")
@@ -3,6 +3,7 @@ from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_http_methods
 from shared.models import Video, VideoStatus
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -12,6 +13,7 @@ def blacklist_video(request, youtube_id):
         video = Video.objects.get(youtube_id=youtube_id)
         video.status = VideoStatus.BLACKLISTED
         video.save()
+        notify_videos_changed([video])
         messages.success(request, "Video has been blacklisted successfully.")
     except Video.DoesNotExist:
         messages.error(request, "Video not found.")
@@ -3,6 +3,7 @@ from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from shared.models import Video, VideoStatus
 from .get_current_frontend import get_current_frontend
+from .video_status_counts import invalidate_video_status_counts
 
 def extract_youtube_id(url):
     """Extract YouTube video ID from URL"""
@@ -53,6 +54,7 @@ def bulk_import_videos(request):
                 print(f"Error importing video {video_id}: {str(e)}")
         
         if successful_imports > 0:
+            invalidate_video_status_counts([frontend])
             messages.success(request, f"Successfully imported {successful_imports} video(s).")
         if failed_imports > 0:
             messages.warning(request, f"Failed to import {failed_imports} video(s). Please check the format of the links.")
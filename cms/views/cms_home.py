@@ -1,24 +1,26 @@
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.cache import never_cache
-from shared.models import Video, VideoStatus
+from shared.models import VideoStatus
 from .get_current_frontend import get_current_frontend
+from .video_status_counts import get_video_status_counts
 
 @staff_member_required
 @never_cache
 def cms_home(request):
     """Home view for the CMS"""
     frontend = get_current_frontend(request)
-    # Get video statistics
-    total_videos = Video.objects.filter(frontend=frontend).count()
-    needs_review = Video.objects.filter(frontend=frontend, status=VideoStatus.NEEDS_REVIEW).count()
-    shortlisted = Video.objects.filter(frontend=frontend, status=VideoStatus.SHORTLISTED).count()
-    longlisted = Video.objects.filter(frontend=frontend, status=VideoStatus.LONGLISTED).count()
-    not_relevant = Video.objects.filter(frontend=frontend, status=VideoStatus.NOT_RELEVANT).count()
-    snippets_generated = Video.objects.filter(frontend=frontend, status=VideoStatus.SNIPPETS_GENERATED).count()
-    snippets_and_translations_generated = Video.objects.filter(frontend=frontend, status=VideoStatus.SNIPPETS_AND_TRANSLATIONS_GENERATED).count()
-    live = Video.objects.filter(frontend=frontend, status=VideoStatus.LIVE).count()
-    blacklisted = Video.objects.filter(frontend=frontend, status=VideoStatus.BLACKLISTED).count()
+    # Get video statistics (cached, see video_status_counts)
+    status_counts = get_video_status_counts(frontend)
+    total_videos = sum(status_counts.values())
+    needs_review = status_counts[VideoStatus.NEEDS_REVIEW]
+    shortlisted = status_counts[VideoStatus.SHORTLISTED]
+    longlisted = status_counts[VideoStatus.LONGLISTED]
+    not_relevant = status_counts[VideoStatus.NOT_RELEVANT]
+    snippets_generated = status_counts[VideoStatus.SNIPPETS_GENERATED]
+    snippets_and_translations_generated = status_counts[VideoStatus.SNIPPETS_AND_TRANSLATIONS_GENERATED]
+    live = status_counts[VideoStatus.LIVE]
+    blacklisted = status_counts[VideoStatus.BLACKLISTED]
     
     context = {
         'total_videos': total_videos,
@@ -0,0 +1,61 @@
+from django.conf import settings
+from shared.models import Video, Frontend
+from youtube_transcript_api import YouTubeTranscriptApi
+from .subtitle_checker import NO_SUBTITLES_ERRORS
+from .transcript_cache import (
+    CachedTranscript, get_cached_transcript_keys, has_no_manual_transcript, mark_no_manual_transcript,
+    read_cached_transcript, store_transcript,
+)
+
+# The subtitle language codes of each frontend start with
+SUBTITLE_LANGUAGE_PREFIXES = {
+    Frontend.ARABIC: 'ar',
+    Frontend.GERMAN: 'de',
+}
+
+
+class NoTranscriptAvailable(Exception):
+    """The video has no subtitles in its frontend's language"""
+
+
+def fetch_video_transcript(video:Video, client=YouTubeTranscriptApi, refresh:bool=False) -> CachedTranscript:
+    """The transcript to generate the video's snippets from: manual subtitles preferred over auto-generated ones.
+    Served from the transcript cache without network calls if it has a manual transcript, or an auto-generated one
+    and the subtitle list showed no manual one within TRANSCRIPT_CACHE_MANUAL_CHECK_TTL (so manual subtitles uploaded
+    later are picked up). Otherwise, or with refresh, one list_transcripts call (which also stores the video's
+    available subtitle languages) picks the transcript, which is read from the cache or fetched and cached"""
+    prefix = SUBTITLE_LANGUAGE_PREFIXES.get(video.frontend, video.frontend)
+
+    if not refresh:
+        cached_keys = [
+            (language_code, is_generated) for language_code, is_generated in get_cached_transcript_keys(video.youtube_id)
+            if language_code.startswith(prefix)
+        ]
+        # auto-generated ones only while the last listing without manual subtitles is recent
+        if not has_no_manual_transcript(video.youtube_id, prefix, settings.TRANSCRIPT_CACHE_MANUAL_CHECK_TTL):
+            cached_keys = [(language_code, is_generated) for language_code, is_generated in cached_keys if not is_generated]
+        # manual first
+        for language_code, is_generated in sorted(cached_keys, key=lambda key: key[1]):
+            cached = read_cached_transcript(video.youtube_id, language_code, is_generated)
+            if cached:
+                return cached
+
+    try:
+        transcripts = list(client.list_transcripts(video.youtube_id))
+    except NO_SUBTITLES_ERRORS:
+        transcripts = []
+    video.available_subtitle_languages = [transcript.language_code for transcript in transcripts]
+    video.checked_for_relevant_subtitles = True
+    video.save(update_fields=['available_subtitle_languages', 'checked_for_relevant_subtitles'])
+
+    target_transcripts = [transcript for transcript in transcripts if transcript.language_code.startswith(prefix)]
+    if not target_transcripts:
+        raise NoTranscriptAvailable(f"No {video.frontend} subtitles available for this video.")
+    # Prefer manual transcripts over auto-generated ones
+    transcript = next((t for t in target_transcripts if not t.is_generated), target_transcripts[0])
+    if transcript.is_generated:
+        mark_no_manual_transcript(video.youtube_id, prefix)
+    cached = read_cached_transcript(video.youtube_id, transcript.language_code, transcript.is_generated)
+    if cached:
+        return cached
+    return store_transcript(video.youtube_id, transcript.language_code, transcript.is_generated, transcript.fetch())
@@ -2,53 +2,73 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_http_methods
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.db import transaction
 
 from shared.models import Video, VideoStatus, Word, Meaning
-from .get_words_with_translations import get_words_with_translations
+from frontend.interactors.snippet_practice_payload import invalidate_snippet_practice_payloads_for_video, refresh_snippet_practice_payloads_for_video
+from .notify_videos_changed import notify_videos_changed
+from .translate_snippets import translate_snippets, OpenAIVocabProvider
 
-@staff_member_required
-@require_http_methods(["POST"])
-def generate_translations(request, youtube_id):
-    """View to generate translations for all snippets in a video"""
-    try:
-        video = Video.objects.get(youtube_id=youtube_id)
-        
-        if not video.snippets.exists():
-            messages.error(request, "No snippets available. Please generate snippets first.")
-            return redirect('cms:video_details', youtube_id=youtube_id)
-        
+def generate_video_translations(video, provider=None) -> int:
+    """(Re)generate the words and meanings of all of the video's snippets; returns the number of word entries.
+    All LLM requests run (batched and concurrent, see translate_snippets) before the old words are touched,
+    the old words are then replaced in one transaction"""
+    provider = provider or OpenAIVocabProvider()
+    snippets = list(video.snippets.all())
+    words_by_snippet = translate_snippets(snippets, video.frontend, provider=provider)
+
+    # Drop cached practice payloads touched by the words about to be deleted
+    invalidate_snippet_practice_payloads_for_video(video)
+
+    total_words = 0
+    with transaction.atomic():
         # Delete existing words and meanings
         Word.objects.filter(videos=video).delete()
-        
-        # Process each snippet
-        for snippet in video.snippets.all():
-            # Get words and translations for this snippet
-            words_with_translations = get_words_with_translations(snippet.content, video.frontend)
-            
-            # Process each word
-            for word_entry in words_with_translations:
+
+        for snippet in snippets:
+            for word_entry in words_by_snippet.get(snippet.id, []):
                 # Get or create the word
                 word_obj, _ = Word.objects.get_or_create(
                     original_word=word_entry.word
                 )
-                
+
                 # Add the video and snippet to the word's relationships
                 word_obj.videos.add(video)
                 word_obj.occurs_in_snippets.add(snippet)
-                
+
                 # Create the meaning
                 Meaning.objects.create(
                     word=word_obj,
                     en=word_entry.translation,
                     snippet_context=snippet,
-                    creation_method="ChatGPT 1.0.0"
+                    creation_method=provider.creation_method
                 )
-        
+                total_words += 1
+
         # Update video status
         video.status = VideoStatus.SNIPPETS_AND_TRANSLATIONS_GENERATED
         video.save()
+
+    # Rebuild cached practice payloads for the new words and meanings
+    refresh_snippet_practice_payloads_for_video(video)
+    notify_videos_changed([video])
+    return total_words
+
+
+@staff_member_required
+@require_http_methods(["POST"])
+def generate_translations(request, youtube_id):
+    """View to generate translations for all snippets in a video"""
+    try:
+        video = Video.objects.get(youtube_id=youtube_id)
+        
+        if not video.snippets.exists():
+            messages.error(request, "No snippets available. Please generate snippets first.")
+            return redirect('cms:video_details', youtube_id=youtube_id)
+        
+        total_words = generate_video_translations(video)
         
-        messages.success(request, "Successfully generated translations for all snippets.")
+        messages.success(request, f"Successfully generated {total_words} words and translations for all snippets.")
             
     except Video.DoesNotExist:
         messages.error(request, "Video not found.")
@@ -5,6 +5,7 @@ from googleapiclient.discovery import build
 
 from shared.models import Video, Frontend, VideoStatus
 from .get_current_frontend import get_current_frontend
+from .video_status_counts import invalidate_video_status_counts
 
 @staff_member_required
 def import_playlist_videos(request):
@@ -114,6 +115,8 @@ def import_playlist_videos(request):
                     if not next_page_token:
                         break
                 
+                if imported_count:
+                    invalidate_video_status_counts([frontend])
                 context['success'] = f"Successfully imported {imported_count} new videos from playlist '{playlist_title}'"
                 if remaining_videos > 0:
                     context['remaining'] = remaining_videos
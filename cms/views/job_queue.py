@@ -0,0 +1,194 @@
+import threading
+import traceback
+from datetime import timedelta
+from django.db import close_old_connections, connection
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from cms.models import Job, JobItem, JobItemStatus
+
+# Database-backed job queue for the CMS batch actions, no outside services.
+# A view enqueues a Job with one JobItem per video and returns right away;
+# `manage.py run_jobs` claims the items one at a time per thread and runs the handler
+# registered for the job's kind (@job_handler) on each item's video.
+# A batch handler (@job_handler(kind, batch_size=n)) instead gets up to n claimed items of the same job at once,
+# for actions that are cheaper in bulk; it returns the outcome per video and the queue records each item on its own.
+# A failing item is retried with exponential backoff until its max_attempts are used up;
+# a handler raises JobItemSkipped for videos that don't need (or can't get) the action, which is not retried.
+# Claiming is a conditional UPDATE on the item's status, so any number of workers can share the table.
+# A claim is a lease: the worker records the outcome only while the item is still running on its attempt,
+# so a worker whose lease expired (and whose item was claimed again) can't overwrite the new attempt.
+
+# longer than any single item takes (a long video's translations), or a second worker would start on it
+LEASE = timedelta(minutes=30)
+RETRY_BACKOFF = timedelta(seconds=30)
+CLAIM_CANDIDATES = 20
+ACTIVE_STATUSES = [JobItemStatus.PENDING, JobItemStatus.RUNNING]
+
+_handlers = {}
+_batch_handlers = {}
+
+
+class JobItemSkipped(Exception):
+    """Raised by a handler when the video doesn't need the action (anymore); the message ends up in the item's result"""
+
+
+def job_handler(kind:str, batch_size:int|None=None):
+    """Register the decorated function(video) -> str as the handler of a JobKind; the returned text is the item's result.
+    With batch_size, the function(videos) -> {video id: result text or exception} handles up to batch_size items at once"""
+    def register(handler):
+        if batch_size:
+            _batch_handlers[kind] = (handler, batch_size)
+        else:
+            _handlers[kind] = handler
+        return handler
+    return register
+
+
+def enqueue_video_job(kind:str, frontend:str, videos, user=None, max_attempts:int=3) -> Job|None:
+    """Enqueue a job for the videos that aren't already queued for the same kind; None if there are none"""
+    video_ids = set(videos.values_list('id', flat=True)) if hasattr(videos, 'values_list') else {video.id for video in videos}
+    # the videos' ids in an IN clause could exceed SQLite's variable limit, so take the difference in Python
+    video_ids -= set(JobItem.objects.filter(job__kind=kind, status__in=ACTIVE_STATUSES).values_list('video_id', flat=True))
+    if not video_ids:
+        return None
+    job = Job.objects.create(kind=kind, frontend=frontend, created_by=user if user and user.is_authenticated else None)
+    JobItem.objects.bulk_create(
+        [JobItem(job=job, video_id=video_id, max_attempts=max_attempts) for video_id in sorted(video_ids)],
+        batch_size=1000,
+    )
+    return job
+
+
+def get_recent_jobs(frontend:str, limit:int=10) -> list[Job]:
+    """The latest jobs of the frontend, annotated with the number of items per status (item_count, pending_count, ...)"""
+    counts = {f'{status}_count': Count('items', filter=Q(items__status=status)) for status in JobItemStatus.values}
+    return list(Job.objects.filter(frontend=frontend).annotate(item_count=Count('items'), **counts).order_by('-id')[:limit])
+
+
+def claim_job_item(job_id:int|None=None) -> JobItem|None:
+    """Mark the next runnable item (of the job, if given) as running (one more attempt) and return it,
+    or None if there is nothing to do"""
+    now = timezone.now()
+    claimable = Q(status=JobItemStatus.PENDING, run_after__lte=now) | Q(status=JobItemStatus.RUNNING, locked_until__lt=now)
+    if job_id is not None:
+        claimable &= Q(job_id=job_id)
+    candidates = JobItem.objects.filter(claimable).order_by('run_after', 'id').values_list('id', flat=True)[:CLAIM_CANDIDATES]
+    for item_id in candidates:
+        # another worker may have claimed it since; the update only succeeds for one of them
+        claimed = JobItem.objects.filter(claimable, id=item_id).update(
+            status=JobItemStatus.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_until=now + LEASE,
+        )
+        if claimed:
+            return JobItem.objects.select_related('job', 'video').get(id=item_id)
+    return None
+
+
+def _update_claimed_job_item(item:JobItem, **fields) -> bool:
+    """Update the item if it is still running on the claimed attempt; False if the lease was lost"""
+    updated = JobItem.objects.filter(id=item.id, status=JobItemStatus.RUNNING, attempts=item.attempts).update(**fields)
+    if not updated:
+        print(f"Job item {item.id} was claimed again after its lease expired, dropping the outcome of attempt {item.attempts}")
+    return bool(updated)
+
+
+def _finish_job_item(item:JobItem, status:str, result:str):
+    _update_claimed_job_item(item, status=status, result=result, locked_until=None, finished_at=timezone.now())
+
+
+def _record_outcome(item:JobItem, result:str|None=None, error:Exception|None=None) -> str:
+    """Record the handler's result or error on the claimed item; returns the item's new status"""
+    if error is None:
+        _finish_job_item(item, JobItemStatus.DONE, result or '')
+        return JobItemStatus.DONE
+    if isinstance(error, JobItemSkipped):
+        _finish_job_item(item, JobItemStatus.SKIPPED, str(error))
+        return JobItemStatus.SKIPPED
+    message = f"{type(error).__name__}: {error}"
+    if item.attempts >= item.max_attempts:
+        _finish_job_item(item, JobItemStatus.FAILED, message)
+        return JobItemStatus.FAILED
+    _update_claimed_job_item(
+        item,
+        status=JobItemStatus.PENDING,
+        result=message,
+        locked_until=None,
+        run_after=timezone.now() + RETRY_BACKOFF * 2 ** (item.attempts - 1),
+    )
+    print(f"Job item {item.id} ({item.video.youtube_id}) failed, will retry: {message}")
+    return JobItemStatus.PENDING
+
+
+def run_job_item(item:JobItem) -> str:
+    """Run the handler on the claimed item and record the outcome; returns the item's new status"""
+    handler = _handlers.get(item.job.kind)
+    try:
+        if handler is None:
+            raise JobItemSkipped(f"No handler for {item.job.kind}")
+        result = handler(item.video)
+    except Exception as e:
+        if not isinstance(e, JobItemSkipped):
+            traceback.print_exc()
+        return _record_outcome(item, error=e)
+    return _record_outcome(item, result=result)
+
+
+def run_job_items(items:list[JobItem]) -> list[str]:
+    """Run the batch handler on the claimed items (all of one job) and record each outcome; returns their new statuses"""
+    handler, _ = _batch_handlers[items[0].job.kind]
+    try:
+        outcomes = handler([item.video for item in items])
+    except Exception as e:
+        traceback.print_exc()
+        outcomes = {item.video_id: e for item in items}
+    statuses = []
+    for item in items:
+        outcome = outcomes.get(item.video_id, RuntimeError("No outcome from the batch handler"))
+        if isinstance(outcome, Exception):
+            statuses.append(_record_outcome(item, error=outcome))
+        else:
+            statuses.append(_record_outcome(item, result=outcome))
+    return statuses
+
+
+def run_next_job_item() -> bool:
+    """Claim and run one item; False if there was nothing to do"""
+    item = claim_job_item()
+    if item is None:
+        return False
+    if item.job.kind in _batch_handlers:
+        _, batch_size = _batch_handlers[item.job.kind]
+        items = [item]
+        while len(items) < batch_size and (next_item := claim_job_item(job_id=item.job_id)):
+            items.append(next_item)
+        run_job_items(items)
+    else:
+        run_job_item(item)
+    return True
+
+
+def run_job_worker(concurrency:int=1, poll_interval:float=5, until_idle:bool=False, stop:threading.Event|None=None, log=print):
+    """Work off job items with `concurrency` threads until stopped (or, with until_idle, until nothing is left)"""
+    stop = stop or threading.Event()
+
+    def work():
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                if run_next_job_item():
+                    continue
+                if until_idle:
+                    return
+                stop.wait(poll_interval)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=work, name=f"job-worker-{index}", daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    log(f"Job worker running with {concurrency} thread(s)")
+    # join with a timeout, so the main thread stays responsive to signals
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1)
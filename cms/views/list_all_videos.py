@@ -1,22 +1,28 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render
-from django.core.paginator import Paginator
 from django.views.decorators.cache import never_cache
+from django.core.cache import cache
+import hashlib
 
 from shared.models import Video, VideoStatus
+from frontend.interactors.keyset_page import get_keyset_page
 from .get_current_frontend import get_current_frontend
 
+# Counting all matching videos would cost a full scan per page view, so the total is cached for a while
+# (it's shown as an approximate number)
+VIDEO_COUNT_TIMEOUT = 5 * 60
+
 @staff_member_required
 @never_cache
 def list_all_videos(request):
     """View to list all videos with their status"""
     frontend = get_current_frontend(request)
-    # Get page number and status filter from request
-    page_number = request.GET.get('page', 1)
+    # Get page cursor and status filter from request
+    cursor = request.GET.get('cursor')
     status_filter = request.GET.get('status', '')
     comment_filter = request.GET.get('comment', '')
     
-    # Get all videos ordered by status and youtube_id
+    # Get all videos of the frontend
     videos = Video.objects.filter(frontend=frontend)
     
     # Apply status filter if provided
@@ -27,15 +33,17 @@ def list_all_videos(request):
     if comment_filter:
         videos = videos.filter(comment__icontains=comment_filter)
     
-    videos = videos.order_by('status', 'youtube_id')
-    
-    # Paginate the videos
-    paginator = Paginator(videos, 20)
-    page_obj = paginator.get_page(page_number)
+    # Page through the videos ordered by status and youtube_id (keyset pagination)
+    page, next_cursor, previous_cursor = get_keyset_page(videos, ['status', 'youtube_id'], cursor, 20)
+
+    filters_hash = hashlib.md5(f"{frontend}:{status_filter}:{comment_filter}".encode()).hexdigest()
+    approximate_count = cache.get_or_set(f"cms_video_count:{filters_hash}", videos.count, VIDEO_COUNT_TIMEOUT)
     
     context = {
-        'videos': page_obj,
-        'page_obj': page_obj,
+        'videos': page,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
+        'approximate_count': approximate_count,
         'status_filter': status_filter,
         'comment_filter': comment_filter,
         'status_choices': VideoStatus.choices,
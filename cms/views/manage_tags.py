@@ -3,6 +3,8 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 
 from shared.models import Tag, TagType
+from .tag_prefix_index import invalidate_tag_prefix_index
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 def manage_tags(request, tag_id=None):
@@ -29,10 +31,14 @@ def manage_tags(request, tag_id=None):
                 tag.name = name
                 tag.type = type
                 tag.save()
+                # the tag name is part of the videos' search documents
+                notify_videos_changed(tag.videos.all())
+                invalidate_tag_prefix_index()
                 messages.success(request, "Tag updated successfully.")
             else:
                 # Create new tag
                 Tag.objects.create(name=name, type=type)
+                invalidate_tag_prefix_index()
                 messages.success(request, "Tag created successfully.")
             return redirect('cms:manage_tags')
         except Exception as e:
@@ -5,6 +5,7 @@ from django.contrib import messages
 
 from shared.models import Video, Frontend, VideoStatus
 from .get_current_frontend import get_current_frontend
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -22,6 +23,7 @@ def mark_videos_without_relevant_subtitles(request):
         )
         
         marked_count = 0
+        marked_videos = []
         
         for video in videos:
             # Check if video has target language subtitles
@@ -36,7 +38,9 @@ def mark_videos_without_relevant_subtitles(request):
                 video.checked_for_relevant_subtitles = True
                 video.save()
                 marked_count += 1
+                marked_videos.append(video)
         
+        notify_videos_changed(marked_videos)
         messages.success(request, f"Successfully marked {marked_count} videos without {frontend} subtitles as not relevant.")
     except Exception as e:
         messages.error(request, f"Error marking videos: {str(e)}")
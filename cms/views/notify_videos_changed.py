@@ -0,0 +1,11 @@
+from frontend.interactors.video_share_page_cache import invalidate_video_share_pages
+from frontend.interactors.video_search_index import update_video_search_documents
+from frontend.interactors.video_list_cache import bump_catalogue_versions
+from .video_status_counts import invalidate_video_status_counts
+
+def notify_videos_changed(videos):
+    """Call after changing videos' status, snippets, metadata or tags, so caches built from them are dropped"""
+    videos = list(videos)
+    invalidate_video_share_pages([video.youtube_id for video in videos])
+    bump_catalogue_versions(update_video_search_documents(videos))
+    invalidate_video_status_counts(video.frontend for video in videos)
@@ -4,6 +4,7 @@ from django.shortcuts import redirect
 from django.contrib import messages
 
 from shared.models import Video, VideoStatus
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -18,6 +19,7 @@ def publish_video(request, youtube_id):
         
         video.status = VideoStatus.LIVE
         video.save()
+        notify_videos_changed([video])
         
         messages.success(request, "Video has been published successfully.")
             
@@ -6,6 +6,7 @@ from django.db import models
 
 from shared.models import Video, Frontend, VideoStatus
 from .get_current_frontend import get_current_frontend
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -23,8 +24,10 @@ def publish_videos_with_many_snippets(request):
             snippet_count__gt=5
         )
         
-        count = videos.count()
-        videos.update(status=VideoStatus.LIVE)
+        published_videos = list(videos)
+        count = len(published_videos)
+        Video.objects.filter(id__in=[video.id for video in published_videos]).update(status=VideoStatus.LIVE)
+        notify_videos_changed(published_videos)
         
         messages.success(request, f"Successfully published {count} videos with more than 5 snippets.")
     except Exception as e:
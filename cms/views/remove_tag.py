@@ -4,6 +4,8 @@ from django.shortcuts import redirect
 from django.contrib import messages
 
 from shared.models import Video, Tag
+from .tag_prefix_index import invalidate_tag_prefix_index
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -13,6 +15,8 @@ def remove_tag(request, youtube_id, tag_id):
         video = Video.objects.get(youtube_id=youtube_id)
         tag = Tag.objects.get(id=tag_id)
         video.tags.remove(tag)
+        notify_videos_changed([video])
+        invalidate_tag_prefix_index()
         messages.success(request, f"Successfully removed tag '{tag.name}' from video.")
     except Video.DoesNotExist:
         messages.error(request, "Video not found.")
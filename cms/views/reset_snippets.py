@@ -4,6 +4,10 @@ from django.shortcuts import redirect
 from django.contrib import messages
 
 from shared.models import Video, VideoStatus
+from frontend.interactors.snippet_practice_payload import invalidate_snippet_practice_payloads_for_video
+from frontend.interactors.reset_video_progress_summaries import reset_video_progress_summaries
+from frontend.interactors.snippet_timeline import update_snippet_timeline
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -18,12 +22,19 @@ def reset_snippets(request, youtube_id):
             messages.error(request, "Video must have snippets generated to reset them.")
             return redirect('cms:video_details', youtube_id=youtube_id)
         
+        # Drop cached practice payloads of these snippets and of snippets sharing their words
+        invalidate_snippet_practice_payloads_for_video(video)
+        # The users' snippet progress goes with the snippets
+        reset_video_progress_summaries(video)
+
         # Delete snippets (this will cascade delete words and meanings)
         video.snippets.all().delete()
+        update_snippet_timeline(video)
         
         # Reset status to shortlisted
         video.status = VideoStatus.SHORTLISTED
         video.save()
+        notify_videos_changed([video])
         
         messages.success(request, "Snippets and translations have been reset successfully.")
             
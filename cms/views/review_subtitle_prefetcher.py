@@ -0,0 +1,39 @@
+from django.db import close_old_connections, connection
+from shared.models import Video, Frontend, VideoStatus
+from .subtitle_checker import shared_subtitle_checker
+
+# Keeps the subtitle availability of the review queue probed ahead of the editors,
+# so review_videos and video_details only read stored results (and show "pending" for the rest).
+# Runs as a thread of the job worker (run_jobs): every round probes the unchecked videos among the
+# next REVIEW_PREFETCH_AHEAD of each frontend's review queue, in the queue's -priority order.
+REVIEW_PREFETCH_AHEAD = 150  # three pages of review_videos
+PREFETCH_INTERVAL = 30
+
+
+def prefetch_review_subtitles(checker=shared_subtitle_checker, ahead:int=REVIEW_PREFETCH_AHEAD) -> dict:
+    """Probe the unchecked videos at the front of every review queue, highest priority first;
+    returns the checker's counts (checked, failed)"""
+    videos = []
+    for frontend in Frontend.values:
+        queue = Video.objects.filter(frontend=frontend, status=VideoStatus.NEEDS_REVIEW).order_by(
+            '-priority', 'youtube_id'
+        ).only('id', 'youtube_id', 'priority', 'checked_for_relevant_subtitles')[:ahead]
+        videos.extend(video for video in queue if not video.checked_for_relevant_subtitles)
+    videos.sort(key=lambda video: -video.priority)
+    return checker.check(videos)
+
+
+def run_review_subtitle_prefetcher(stop, interval:float=PREFETCH_INTERVAL, log=print):
+    """Prefetch until the stop event is set; goes on right away while there is work, waits `interval` otherwise"""
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                stats = prefetch_review_subtitles()
+            except Exception as e:
+                log(f"Prefetching review subtitles failed: {str(e)}")
+                stats = {'checked': 0}
+            if not stats['checked']:
+                stop.wait(interval)
+    finally:
+        connection.close()
@@ -4,6 +4,8 @@ from django.conf import settings
 from googleapiclient.discovery import build
 
 from shared.models import Video, Frontend, VideoStatus, Tag
+from .tag_prefix_index import invalidate_tag_prefix_index
+from .video_status_counts import invalidate_video_status_counts
 from .get_current_frontend import get_current_frontend
 
 @staff_member_required
@@ -76,6 +78,10 @@ def search_videos(request):
                     video.tags.add(tag)
                     imported_count += 1
             
+            if imported_count:
+                invalidate_tag_prefix_index()
+                invalidate_video_status_counts([frontend])
+            
             context = {
                 'search_query': search_query,
                 'imported_count': imported_count,
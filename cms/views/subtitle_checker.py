@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from shared.models import Video
+from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, VideoUnavailable
+
+# Checks which subtitle languages videos have, many at a time.
+# The check is one network call per video, so a thread pool runs up to `concurrency` of them at once,
+# a token bucket keeps the calls under `rate` per second (YouTube blocks clients that go faster),
+# and failed calls are retried with exponential backoff (with jitter) up to max_retries times.
+# Only the threads talk to the network; the results are written from the calling thread,
+# with one bulk_update per chunk of videos.
+# The client is anything with list_transcripts(video_id) -> iterable of objects with a language_code,
+# YouTubeTranscriptApi by default; benchmarks pass a local stub.
+
+# Videos that definitely have no subtitles (not worth retrying)
+NO_SUBTITLES_ERRORS = (TranscriptsDisabled, VideoUnavailable)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` saved up"""
+
+    def __init__(self, rate:float, burst:int=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting until there is one"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SubtitleChecker:
+    def __init__(self, client=None, concurrency:int=8, rate:float=5.0, burst:int=5, max_retries:int=4, backoff:float=1.0,
+                 bucket:TokenBucket|None=None):
+        self.client = client or YouTubeTranscriptApi
+        self.concurrency = concurrency
+        # pass another checker's bucket to share its rate limit
+        self.bucket = bucket or TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def available_languages(self, youtube_id:str) -> list[str]|None:
+        """The video's subtitle language codes, [] if it has none, None if every attempt failed"""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                return [transcript.language_code for transcript in self.client.list_transcripts(youtube_id)]
+            except NO_SUBTITLES_ERRORS:
+                return []
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"Checking subtitles of {youtube_id} failed: {str(e)}")
+                    return None
+                time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+
+    def check(self, videos, chunk_size:int=200, progress=None) -> dict:
+        """Check and store the subtitle languages of the videos; videos whose check failed stay unchecked.
+        Returns the number of checked and failed videos, and the ids of the failed ones"""
+        checked_count = 0
+        failed_ids = []
+        videos = iter(videos)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='subtitle-check') as pool:
+            while True:
+                chunk = [video for _, video in zip(range(chunk_size), videos)]
+                if not chunk:
+                    break
+                checked = []
+                for video, languages in zip(chunk, pool.map(self.available_languages, [video.youtube_id for video in chunk])):
+                    if languages is None:
+                        failed_ids.append(video.id)
+                        continue
+                    video.available_subtitle_languages = languages
+                    video.checked_for_relevant_subtitles = True
+                    checked.append(video)
+                Video.objects.bulk_update(checked, ['available_subtitle_languages', 'checked_for_relevant_subtitles'])
+                checked_count += len(checked)
+                if progress:
+                    progress(checked_count, len(failed_ids))
+        return {'checked': checked_count, 'failed': len(failed_ids), 'failed_ids': failed_ids}
+
+
+# Shared by the job worker threads and the review prefetcher of a process, so together they stay under one rate limit;
+# for thousands of videos at once use the check_subtitles command (own thread pool, bulk writes)
+shared_subtitle_checker = SubtitleChecker(max_retries=2)
+# For the job queue's check items: the queue retries failed items itself (with its own backoff), so no retries here
+job_subtitle_checker = SubtitleChecker(max_retries=0, bucket=shared_subtitle_checker.bucket)
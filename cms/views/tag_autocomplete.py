@@ -1,20 +1,17 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.http import JsonResponse
-from django.db.models import Q
 
-from shared.models import Tag
+from .tag_prefix_index import get_tag_suggestions
 
 @staff_member_required
 def tag_autocomplete(request):
     """View to provide tag suggestions for autocomplete"""
-    query = request.GET.get('q', '').strip().lower()
+    query = request.GET.get('q', '').strip()
     
     if len(query) < 2:
         return JsonResponse({'tags': []})
     
-    # Search for tags that start with the query
-    tags = Tag.objects.filter(
-        Q(name__istartswith=query) | Q(name__icontains=f" {query}")
-    ).values('name')[:10]
+    # Most used tags with a word starting with the query, from the in-memory prefix index
+    tags = [{'name': name} for name in get_tag_suggestions(query)]
     
-    return JsonResponse({'tags': list(tags)})
+    return JsonResponse({'tags': tags})
@@ -0,0 +1,133 @@
+import bisect
+import heapq
+import threading
+import time
+from django.core.cache import cache
+from django.db.models import Count
+from shared.models import Tag
+from shared.search_keys import normalize_search_text
+
+# Per-process prefix index over tag names for the tag autocomplete.
+# Every word start of a tag's search key is an entry ("kochen rezepte" -> "kochen rezepte", "rezepte"),
+# kept in a sorted list, so the entries matching a query are one bisect range.
+# Suggestions are ranked by usage (number of videos with the tag). Every prefix matching more than
+# SCAN_LIMIT entries has its top suggestions precomputed, any other prefix scans its (small) range,
+# so a suggestion never looks at more than SCAN_LIMIT entries.
+# The index is built on first use. Changes to tags bump a version in the shared cache
+# (invalidate_tag_prefix_index), which every process checks at most every VERSION_CHECK_INTERVAL seconds.
+
+SCAN_LIMIT = 64
+SUGGESTION_LIMIT = 10
+VERSION_CHECK_INTERVAL = 5
+VERSION_KEY = 'tag_prefix_index_version'
+
+
+class TagPrefixIndex:
+    def __init__(self, tags):
+        """tags: (name, search_key, usage) tuples"""
+        entries = []
+        for name, search_key, usage in tags:
+            for position, char in enumerate(search_key):
+                if position == 0 or search_key[position - 1] == ' ' and char != ' ':
+                    entries.append((search_key[position:], -usage, name))
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.entries = entries
+        self.top_by_prefix = {}
+        self._precompute_large_prefixes()
+
+    def _range(self, prefix, start=0, end=None):
+        start = bisect.bisect_left(self.keys, prefix, start, end if end is not None else len(self.keys))
+        end = bisect.bisect_left(self.keys, prefix + '\U0010ffff', start, end if end is not None else len(self.keys))
+        return start, end
+
+    def _top(self, start, end, limit=SUGGESTION_LIMIT):
+        # a tag can have several entries under one prefix, so take some spare candidates before deduplicating
+        candidates = heapq.nsmallest(limit * 4, ((usage, name) for _, usage, name in self.entries[start:end]))
+        names = []
+        for _, name in candidates:
+            if name not in names:
+                names.append(name)
+                if len(names) == limit:
+                    break
+        return names
+
+    def _precompute_large_prefixes(self):
+        # level by level: split each large range of the previous prefix length into the ranges of its
+        # one character longer prefixes, and keep going into the ones that are still large
+        large_ranges = [(0, len(self.entries))]
+        length = 0
+        while large_ranges:
+            length += 1
+            next_large_ranges = []
+            for start, end in large_ranges:
+                position = start
+                while position < end:
+                    key = self.keys[position]
+                    if len(key) < length:
+                        position += 1
+                        continue
+                    prefix_start, prefix_end = self._range(key[:length], position, end)
+                    if prefix_end - prefix_start > SCAN_LIMIT:
+                        self.top_by_prefix[key[:length]] = self._top(prefix_start, prefix_end)
+                        next_large_ranges.append((prefix_start, prefix_end))
+                    position = prefix_end
+            large_ranges = next_large_ranges
+
+    def suggest(self, query:str, limit:int=SUGGESTION_LIMIT) -> list[str]:
+        if query in self.top_by_prefix and limit <= SUGGESTION_LIMIT:
+            return self.top_by_prefix[query][:limit]
+        start, end = self._range(query)
+        return self._top(start, end, limit)
+
+
+_index = None
+_index_version = None
+_version_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _build_index():
+    tags = Tag.objects.annotate(usage=Count('videos')).values_list('name', 'search_key', 'usage')
+    return TagPrefixIndex(tags.iterator())
+
+
+def get_tag_prefix_index() -> TagPrefixIndex:
+    global _index, _index_version, _version_checked_at
+    now = time.monotonic()
+    if _index is not None and now - _version_checked_at < VERSION_CHECK_INTERVAL:
+        return _index
+    with _lock:
+        if _index is not None and now - _version_checked_at < VERSION_CHECK_INTERVAL:
+            return _index
+        version = _current_version()
+        if _index is None or version != _index_version:
+            _index = _build_index()
+            _index_version = version
+        _version_checked_at = now
+        return _index
+
+
+def get_tag_suggestions(query:str, limit:int=SUGGESTION_LIMIT) -> list[str]:
+    """Names of the most used tags with a word starting with the query"""
+    query = normalize_search_text(query)
+    if not query:
+        return []
+    return get_tag_prefix_index().suggest(query, limit)
+
+
+def invalidate_tag_prefix_index():
+    """Call after creating or renaming tags or changing which videos have them"""
+    global _index
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    # this process rebuilds right away, the others after their next version check
+    with _lock:
+        _index = None
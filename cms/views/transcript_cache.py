@@ -0,0 +1,167 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+from django.conf import settings
+
+# On-disk cache of fetched transcripts, so regenerating snippets (after reset_snippets, or to try
+# another segmentation) needs no network calls.
+# One gzipped JSON file per (youtube_id, language_code, is_generated), in a directory per video,
+# so all cached transcripts of a video are one small directory listing.
+# Reading a transcript touches its file's mtime; when a write takes the cache over
+# TRANSCRIPT_CACHE_MAX_BYTES, the least recently used files are deleted until it fits again.
+# The cache's size is only scanned then: each process tracks the size of its last scan plus its own writes,
+# so writes of other processes are noticed at the next scan (the cache can overshoot a little meanwhile).
+# Files are written to a temp file and renamed, so concurrent workers never read half a transcript.
+# Next to the transcripts, an empty "no-manual~<language prefix>" marker records when the video's subtitle list
+# last showed no manual transcript in that language, so its auto-generated one can be served without a listing.
+
+_evict_lock = threading.Lock()
+# per cache directory: its size as of this process' last scan plus this process' writes since
+_cache_bytes = {}
+
+
+class TranscriptSegment(NamedTuple):
+    text: str
+    start: float
+    duration: float
+
+
+class CachedTranscript(NamedTuple):
+    language_code: str
+    is_generated: bool
+    segments: list[TranscriptSegment]
+
+
+def _video_dir(youtube_id):
+    return os.path.join(settings.TRANSCRIPT_CACHE_DIR, youtube_id)
+
+
+def _file_name(language_code, is_generated):
+    return f"{language_code}~{'generated' if is_generated else 'manual'}.json.gz"
+
+
+def _no_manual_marker_path(youtube_id, language_prefix):
+    return os.path.join(_video_dir(youtube_id), f"no-manual~{language_prefix}")
+
+
+def mark_no_manual_transcript(youtube_id:str, language_prefix:str):
+    """Record that the video's subtitle list has no manual transcript in the language (as of now)"""
+    os.makedirs(_video_dir(youtube_id), exist_ok=True)
+    with open(_no_manual_marker_path(youtube_id, language_prefix), 'w'):
+        pass
+
+
+def has_no_manual_transcript(youtube_id:str, language_prefix:str, max_age:float) -> bool:
+    """Whether the subtitle list showed no manual transcript in the language within the last max_age seconds"""
+    try:
+        return time.time() - os.path.getmtime(_no_manual_marker_path(youtube_id, language_prefix)) < max_age
+    except OSError:
+        return False
+
+
+def get_cached_transcript_keys(youtube_id:str) -> list[tuple[str, bool]]:
+    """(language_code, is_generated) of every cached transcript of the video"""
+    try:
+        names = os.listdir(_video_dir(youtube_id))
+    except FileNotFoundError:
+        return []
+    keys = []
+    for name in names:
+        if name.endswith('.json.gz') and '~' in name:
+            language_code, kind = name[:-len('.json.gz')].rsplit('~', 1)
+            keys.append((language_code, kind == 'generated'))
+    return keys
+
+
+def read_cached_transcript(youtube_id:str, language_code:str, is_generated:bool) -> CachedTranscript|None:
+    """The cached transcript, or None if it isn't cached (or the file is unreadable)"""
+    path = os.path.join(_video_dir(youtube_id), _file_name(language_code, is_generated))
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            segments = [TranscriptSegment(*segment) for segment in json.load(file)]
+        os.utime(path)
+    except (OSError, ValueError, TypeError):
+        return None
+    return CachedTranscript(language_code, is_generated, segments)
+
+
+def store_transcript(youtube_id:str, language_code:str, is_generated:bool, segments) -> CachedTranscript:
+    """Cache the segments (anything with text, start and duration), then evict if the cache got too big"""
+    segments = [TranscriptSegment(segment.text, segment.start, segment.duration) for segment in segments]
+    directory = _video_dir(youtube_id)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, _file_name(language_code, is_generated))
+    try:
+        replaced_bytes = os.path.getsize(path)
+    except OSError:
+        replaced_bytes = 0
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as raw_file, gzip.open(raw_file, 'wt', encoding='utf-8') as file:
+            json.dump([list(segment) for segment in segments], file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    _track_written_bytes(os.path.getsize(path) - replaced_bytes)
+    return CachedTranscript(language_code, is_generated, segments)
+
+
+def _track_written_bytes(written_bytes:int):
+    """Add a write to the tracked cache size; scan (and evict) if the size isn't known yet or went over the limit"""
+    with _evict_lock:
+        cache_bytes = _cache_bytes.get(settings.TRANSCRIPT_CACHE_DIR)
+        if cache_bytes is not None:
+            _cache_bytes[settings.TRANSCRIPT_CACHE_DIR] = cache_bytes + written_bytes
+            if cache_bytes + written_bytes <= settings.TRANSCRIPT_CACHE_MAX_BYTES:
+                return
+    evict_transcripts()
+
+
+def _remove_video_dir_if_empty(directory):
+    # a directory with only its markers left has nothing worth keeping
+    try:
+        names = os.listdir(directory)
+        if any(name.endswith('.json.gz') or name.endswith('.tmp') for name in names):
+            return
+        for name in names:
+            os.unlink(os.path.join(directory, name))
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+
+def evict_transcripts(max_bytes:int|None=None) -> int:
+    """Scan the cache and delete least recently used transcripts until it fits into max_bytes; returns the number of deleted files"""
+    max_bytes = settings.TRANSCRIPT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with _evict_lock:
+        files = []
+        total_bytes = 0
+        for video_entry in os.scandir(settings.TRANSCRIPT_CACHE_DIR):
+            if not video_entry.is_dir():
+                continue
+            for entry in os.scandir(video_entry.path):
+                if entry.name.endswith('.json.gz'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_bytes += stat.st_size
+        if total_bytes <= max_bytes:
+            _cache_bytes[settings.TRANSCRIPT_CACHE_DIR] = total_bytes
+            return 0
+        deleted = 0
+        for _, size, path in sorted(files):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            deleted += 1
+            total_bytes -= size
+            _remove_video_dir_if_empty(os.path.dirname(path))
+            if total_bytes <= max_bytes:
+                break
+        _cache_bytes[settings.TRANSCRIPT_CACHE_DIR] = total_bytes
+        return deleted
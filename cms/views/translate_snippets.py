@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from typing import List
+from django.conf import settings
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+from shared.models import Frontend
+
+# Vocabulary extraction for all snippets of a video, batched and concurrent.
+# Snippets are packed into batches (at most BATCH_SIZE snippets / BATCH_MAX_CHARS characters), numbered
+# within their batch; one structured request per batch returns the vocabulary per snippet number.
+# Batches are requested concurrently on one event loop: at most MAX_CONCURRENCY in flight,
+# started at most REQUESTS_PER_SECOND, failed requests retried with exponential backoff;
+# a batch that still fails cancels the rest, and its error is raised.
+# Snippets a response leaves out are requested once more (as one batch) before they count as without vocabulary.
+# The provider is anything with `async extract_vocab(frontend, {number: text}) -> {number: [WordEntry]}`,
+# `async close()` and a `creation_method` for the stored Meanings; tests pass a fake one.
+
+BATCH_SIZE = 10
+BATCH_MAX_CHARS = 3000
+MAX_CONCURRENCY = 4
+REQUESTS_PER_SECOND = 2.0
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 1.0
+
+BATCH_INSTRUCTIONS = (
+    "\n\nThe text consists of numbered snippets of one transcript. Extract the vocabulary of each snippet separately "
+    "and return it under the snippet's number. Include every snippet number, with an empty list if it has no vocabulary."
+)
+
+
+class WordEntry(BaseModel):
+    word: str
+    translation: str
+
+
+class SnippetWordEntries(BaseModel):
+    snippet: int
+    words: List[WordEntry]
+
+
+class BatchWordEntryResponse(BaseModel):
+    snippets: List[SnippetWordEntries]
+
+
+def get_vocab_prompt(frontend: str) -> str:
+    """The vocabulary extraction instructions for the frontend's language"""
+    if frontend == Frontend.ARABIC:
+        return (
+            "You are an expert in Spoken, Egyptian Arabic. "
+            "Extract language learning vocabulary from the following natural language transcript, ignoring proper nouns like restaurant names, "
+            "exclamations such as 'oh', and other non-translatable words. For each extracted word, provide an English translation suitable to learn the word on its own."
+            "Retain correct capitalization and spelling. If a word appears in a declined, conjugated, or plural form, "
+            "add both the occurring and base form as separate entries (e.g. for 'أشجار' and 'شجرة', or 'بناكل' and 'كل'), both including the translation. Return your answer as a structured list of vocab."
+        )
+    else:  # German
+        return (
+            "You are an expert in German. "
+            "Extract language learning vocabulary from the following text, ignoring proper nouns like restaurant names, "
+            "exclamations such as 'oh', and other non-translatable words. For each extracted word, provide an English translation suitable to learn the word on its own."
+            "Retain correct capitalization and spelling. If a word appears in a declined, conjugated, or plural form, "
+            "add both the occurring and base form as separate entries (e.g. for 'Bäume' and 'Baum', or 'Sie lief' and 'laufen'), both including the translation. Return your answer as a structured list of vocab."
+        )
+
+
+class OpenAIVocabProvider:
+    creation_method = "ChatGPT 1.1.0 batched"
+
+    def __init__(self, model:str="gpt-4o-mini"):
+        self.model = model
+        # created on first use: the client's connections belong to the event loop of the run
+        self.client = None
+
+    async def extract_vocab(self, frontend:str, texts:dict[int, str]) -> dict[int, list[WordEntry]]:
+        if self.client is None:
+            self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        numbered_snippets = "\n".join(f"[{number}] {text}" for number, text in texts.items())
+        response = await self.client.beta.chat.completions.parse(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": get_vocab_prompt(frontend) + BATCH_INSTRUCTIONS + f"\n\nSnippets:\n{numbered_snippets}\n\nOutput JSON:"}
+            ],
+            response_format=BatchWordEntryResponse,
+        )
+        words = {}
+        for entry in response.choices[0].message.parsed.snippets:
+            if entry.snippet in texts:
+                words.setdefault(entry.snippet, []).extend(entry.words)
+        return words
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+
+class AsyncTokenBucket:
+    """Token bucket for coroutines of one event loop: `rate` tokens per second, at most `burst` saved up"""
+
+    def __init__(self, rate:float, burst:int=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def batch_snippets(snippets, batch_size:int=BATCH_SIZE, max_chars:int=BATCH_MAX_CHARS) -> list[list]:
+    """Consecutive snippets packed into batches of at most batch_size snippets and (unless a single snippet is longer) max_chars"""
+    batches = []
+    batch = []
+    chars = 0
+    for snippet in snippets:
+        if batch and (len(batch) >= batch_size or chars + len(snippet.content) > max_chars):
+            batches.append(batch)
+            batch = []
+            chars = 0
+        batch.append(snippet)
+        chars += len(snippet.content)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def _request(provider, frontend, texts, semaphore, bucket, max_attempts):
+    for attempt in range(max_attempts):
+        # rate limit tokens are only taken by requests that can start right away
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                return await provider.extract_vocab(frontend, texts)
+            except Exception as e:
+                if attempt == max_attempts - 1:
+                    raise
+                print(f"Vocab request failed, retrying: {e}")
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt * (1 + random.random()))
+
+
+async def _translate_batch(provider, frontend, batch, semaphore, bucket, max_attempts) -> dict:
+    texts = {number: snippet.content for number, snippet in enumerate(batch, 1)}
+    words = await _request(provider, frontend, texts, semaphore, bucket, max_attempts)
+    missing = {number: text for number, text in texts.items() if number not in words}
+    if missing:
+        words.update(await _request(provider, frontend, missing, semaphore, bucket, max_attempts))
+    return {snippet.id: words.get(number, []) for number, snippet in enumerate(batch, 1)}
+
+
+async def _translate_snippets(snippets, frontend, provider, batch_size, max_concurrency, requests_per_second, max_attempts):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    bucket = AsyncTokenBucket(requests_per_second, burst=max_concurrency)
+    try:
+        # a failing batch cancels the others, so no request is in flight when the provider is closed
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(_translate_batch(provider, frontend, batch, semaphore, bucket, max_attempts))
+                for batch in batch_snippets(snippets, batch_size)
+            ]
+    except ExceptionGroup as errors:
+        # the first batch's error, as if it were the only one (callers report it per video)
+        raise errors.exceptions[0]
+    finally:
+        await provider.close()
+    words_by_snippet = {}
+    for task in tasks:
+        words_by_snippet.update(task.result())
+    return words_by_snippet
+
+
+def translate_snippets(snippets, frontend:str, provider=None, batch_size:int=BATCH_SIZE, max_concurrency:int=MAX_CONCURRENCY,
+                       requests_per_second:float=REQUESTS_PER_SECOND, max_attempts:int=MAX_ATTEMPTS) -> dict[int, list[WordEntry]]:
+    """The vocabulary of every snippet: {snippet.id: [WordEntry]}; raises if a batch still fails after max_attempts.
+    Runs its own event loop, so call it from synchronous code (views, job handlers)"""
+    return asyncio.run(_translate_snippets(
+        list(snippets), frontend, provider or OpenAIVocabProvider(),
+        batch_size, max_concurrency, requests_per_second, max_attempts,
+    ))
@@ -4,6 +4,7 @@ from django.shortcuts import redirect
 from django.contrib import messages
 
 from shared.models import Video, VideoStatus
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -16,6 +17,7 @@ def update_video_status(request, youtube_id):
         if new_status and new_status in [status[0] for status in VideoStatus.choices]:
             video.status = new_status
             video.save()
+            notify_videos_changed([video])
             messages.success(request, f"Successfully updated video status to {new_status}.")
         else:
             messages.error(request, "Invalid status provided.")
@@ -5,6 +5,7 @@ from django.contrib import messages
 from django.http import JsonResponse
 
 from shared.models import Video, VideoStatus
+from .notify_videos_changed import notify_videos_changed
 
 @staff_member_required
 @require_http_methods(["POST"])
@@ -22,6 +23,7 @@ def update_video_statuses(request):
             for video in videos:
                 video.status = bulk_status
                 video.save()
+            notify_videos_changed(videos)
             messages.success(request, f"Successfully updated status for all videos to {bulk_status}.")
             return redirect('cms:review_videos')
         
@@ -40,6 +42,7 @@ def update_video_statuses(request):
                         video.status = new_status
                         video.comment = comment
                         video.save()
+                        notify_videos_changed([video])
                 except Video.DoesNotExist:
                     continue
         
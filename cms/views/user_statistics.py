@@ -3,101 +3,59 @@ from django.shortcuts import render
 from django.contrib.auth.models import User
 from django.db.models import Count
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 
-from frontend.models import VideoProgress, VocabPractice
+from frontend.models import VideoProgress
+from frontend.interactors.site_statistics import get_site_statistics
+
+# Selectable chart ranges in days; the number of queries is the same for all of them
+STATISTICS_RANGES = [7, 30, 90, 365]
 
 @staff_member_required
 def user_statistics(request):
     """View to show user statistics and activity"""
-    # Get date range for charts (last 7 days)
-    today = timezone.now().date()
-    date_range = [today - timedelta(days=i) for i in range(7)]
-    date_range.reverse()
-    
+    days = request.GET.get('days', '')
+    days = int(days) if days.isdigit() and int(days) in STATISTICS_RANGES else STATISTICS_RANGES[0]
+    today = timezone.localdate()
+
+    # One row per day, rolled up for past days and counted live for today
+    statistics = get_site_statistics(today - timedelta(days=days - 1), today)
+    statistics_today = statistics[-1]
+
     # Total users
     total_users = User.objects.count()
-    
-    # Users logged in today
-    users_logged_in_today = User.objects.filter(
-        last_login__date=today
-    ).count()
-    
-    # New registrations today
-    new_registrations_today = User.objects.filter(
-        date_joined__date=today
-    ).count()
-    
-    # Videos practiced today
-    videos_practiced_today = VideoProgress.objects.filter(
-        last_practiced__date=today
-    ).count()
-    
-    # Words practiced today
-    words_practiced_today = VocabPractice.objects.filter(
-        last_review__date=today
-    ).count()
-    
+
     # Most popular videos (all time)
     popular_videos = VideoProgress.objects.values(
         'video__youtube_id', 'video__youtube_title'
     ).annotate(
         practice_count=Count('id')
     ).order_by('-practice_count')[:10]
-    
-    # Most popular videos today
+
+    # Most popular videos today (range instead of __date, so the last_practiced index is used)
     popular_videos_today = VideoProgress.objects.filter(
-        last_practiced__date=today
+        last_practiced__gte=timezone.make_aware(datetime.combine(today, time.min))
     ).values(
         'video__youtube_id', 'video__youtube_title'
     ).annotate(
         practice_count=Count('id')
     ).order_by('-practice_count')[:10]
-    
-    # Daily login data for chart
-    daily_logins = []
-    daily_registrations = []
-    daily_video_practices = []
-    daily_word_practices = []
-    
-    for date in date_range:
-        # Logins
-        logins = User.objects.filter(
-            last_login__date=date
-        ).count()
-        daily_logins.append(logins)
-        
-        # Registrations
-        registrations = User.objects.filter(
-            date_joined__date=date
-        ).count()
-        daily_registrations.append(registrations)
-        
-        # Video practices
-        video_practices = VideoProgress.objects.filter(
-            last_practiced__date=date
-        ).count()
-        daily_video_practices.append(video_practices)
-        
-        # Word practices
-        word_practices = VocabPractice.objects.filter(
-            last_review__date=date
-        ).count()
-        daily_word_practices.append(word_practices)
-    
+
     context = {
+        'days': days,
+        'statistics_ranges': STATISTICS_RANGES,
         'total_users': total_users,
-        'users_logged_in_today': users_logged_in_today,
-        'new_registrations_today': new_registrations_today,
-        'videos_practiced_today': videos_practiced_today,
-        'words_practiced_today': words_practiced_today,
+        'users_logged_in_today': statistics_today['logins'],
+        'new_registrations_today': statistics_today['registrations'],
+        'videos_practiced_today': statistics_today['videos_practiced'],
+        'words_practiced_today': statistics_today['words_practiced'],
         'popular_videos': popular_videos,
         'popular_videos_today': popular_videos_today,
-        'date_range': [date.strftime('%Y-%m-%d') for date in date_range],
-        'daily_logins': daily_logins,
-        'daily_registrations': daily_registrations,
-        'daily_video_practices': daily_video_practices,
-        'daily_word_practices': daily_word_practices,
+        'date_range': [row['day'].strftime('%Y-%m-%d') for row in statistics],
+        'daily_logins': [row['logins'] for row in statistics],
+        'daily_registrations': [row['registrations'] for row in statistics],
+        'daily_video_practices': [row['videos_practiced'] for row in statistics],
+        'daily_word_practices': [row['words_practiced'] for row in statistics],
     }
-    
+
     return render(request, 'user_statistics.html', context)
@@ -1,9 +1,10 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render
-from youtube_transcript_api import YouTubeTranscriptApi
 
 from shared.models import Video, VideoStatus
+from cms.models import JobKind
 from .get_current_frontend import get_current_frontend
+from .job_queue import enqueue_video_job
 
 
 @staff_member_required
@@ -19,15 +20,9 @@ def video_details(request, youtube_id):
             'words__occurs_in_snippets'
         ).get(youtube_id=youtube_id, frontend=frontend)
         
-        # Get available languages if not already set
-        if not video.available_subtitle_languages:
-            try:
-                available_languages = YouTubeTranscriptApi.list_transcripts(video.youtube_id)
-                video.available_subtitle_languages = [lang.language_code for lang in available_languages]
-                video.save()
-            except Exception:
-                video.available_subtitle_languages = []
-                video.save()
+        # Subtitles are probed by the job worker, the page shows them as pending until then
+        if not video.checked_for_relevant_subtitles:
+            enqueue_video_job(JobKind.CHECK_SUBTITLES, video.frontend, [video], user=request.user)
         
         # Get snippet count
         snippet_count = video.snippets.count()
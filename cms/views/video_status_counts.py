@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from django.db.models import Count
+from shared.models import Video, VideoStatus
+
+# Number of videos per VideoStatus of a frontend, for the CMS home page.
+# Counted with one GROUP BY status query and kept in the shared cache per frontend.
+# Everything that changes video statuses or adds videos drops the frontend's counts
+# (invalidate_video_status_counts, also called by notify_videos_changed), so the next home page recounts.
+# Writes that bypass the CMS (admin, shell, loaddata) are reconciled when the counts expire.
+RECONCILE_INTERVAL = 10 * 60
+
+
+def _counts_key(frontend):
+    return f"video_status_counts:{frontend}"
+
+
+def count_video_statuses(frontend:str) -> dict:
+    """{status: number of videos} for every VideoStatus, in one query"""
+    counts = dict.fromkeys(VideoStatus.values, 0)
+    rows = Video.objects.filter(frontend=frontend).values('status').annotate(count=Count('id')).order_by()
+    for row in rows:
+        counts[row['status']] = row['count']
+    return counts
+
+
+def get_video_status_counts(frontend:str) -> dict:
+    """The cached {status: number of videos} of the frontend, recounted on a miss"""
+    return cache.get_or_set(_counts_key(frontend), lambda: count_video_statuses(frontend), RECONCILE_INTERVAL)
+
+
+def invalidate_video_status_counts(frontends):
+    """Call after changing the statuses of videos of the given frontends or adding videos to them"""
+    cache.delete_many([_counts_key(frontend) for frontend in set(frontends)])
@@ -25,8 +25,10 @@ fi
 # 2) push to germanwithvideos
 git push germanwithvideos HEAD:main
 heroku run --app germanwithvideos python manage.py migrate
+heroku run --app germanwithvideos python manage.py createcachetable
 if [ "$NO_FIXTURE" = false ]; then
     heroku run python manage.py loaddata fixture.json --app germanwithvideos
+    heroku run python manage.py rebuild_video_search_index --app germanwithvideos
 fi
 
 # 3) push to arabicwithvideos
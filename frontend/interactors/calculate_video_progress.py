@@ -1,12 +1,11 @@
-from frontend.models import Video
-from frontend.models import SnippetPractice
-from django.contrib.auth.models import User
+from frontend.models import VideoProgress
 
-def calculate_video_progress(video:Video, user:User):
+def calculate_video_progress(video_progress:VideoProgress|None, total_snippets:int):
     # in %, rounded to 2 decimal places
     # 0 if no snippets practiced
     # 100 if all snippets practiced
     # otherwise, the percentage of snippets practiced
-    snippets = video.snippets.all()
-    snippet_practices = SnippetPractice.objects.filter(user=user, snippet__in=snippets)
-    return round(snippet_practices.count() / snippets.count() * 100, 2)   
\ No newline at end of file
+    # read from the rated snippet count on the user's VideoProgress
+    if not video_progress or not total_snippets:
+        return 0
+    return round(video_progress.rated_snippet_count / total_snippets * 100, 2)
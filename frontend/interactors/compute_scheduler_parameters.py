@@ -0,0 +1,15 @@
+from fsrs import ReviewLog, Rating, Optimizer
+
+# Runs inside the worker processes of the fit_scheduler_parameters command,
+# so this module must not import any Django models (the workers don't set up Django).
+
+# function that fits fsrs parameters to one user's review history
+# takes the user id and their reviews as (word_id, rating, reviewed_at) tuples
+# returns (user_id, parameters, review_count)
+def compute_scheduler_parameters(user_id:int, reviews:list[tuple]) -> tuple[int, list[float], int]:
+    review_logs = [
+        ReviewLog(card_id=word_id, rating=Rating(rating), review_datetime=reviewed_at)
+        for word_id, rating, reviewed_at in reviews
+    ]
+    parameters = Optimizer(review_logs).compute_optimal_parameters()
+    return user_id, list(parameters), len(review_logs)
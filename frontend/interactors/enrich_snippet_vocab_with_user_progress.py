@@ -4,25 +4,11 @@
 
 # important model classes: Word, VocabPractice
 
-from frontend.models import VocabPractice
 from frontend.models import Snippet
 from django.contrib.auth.models import User
+from frontend.interactors.get_snippet_words_with_user_progress import get_snippet_words_with_user_progress
 
 
 def enrich_snippet_vocab_with_user_progress(snippet:Snippet, user:User):
-    words = snippet.words.all()
-    # 'ManyRelatedManager' object is not iterable, so the following line is not valid
-    # word_progress = VocabPractice.objects.filter(word__in=words, user=user)
-    words_to_return = []
-    for word in words:
-        has_progress = VocabPractice.objects.filter(word=word, user=user).exists()
-        if has_progress:
-            progress = VocabPractice.objects.get(word=word, user=user)
-            if progress.is_due:
-                word.is_new = False
-                words_to_return.append(word)
-        else:
-            word.is_new = True
-            words_to_return.append(word)
-    return words_to_return
-
+    words = get_snippet_words_with_user_progress(snippet, user)
+    return [word for word in words if word['is_new'] or word['is_due']]
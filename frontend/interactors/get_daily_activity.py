@@ -0,0 +1,21 @@
+import datetime
+from django.contrib.auth.models import User
+from frontend.models import DailyActivity
+
+
+# function that returns the user's activity for every day from start to end (inclusive), oldest first,
+# as dicts (day, words_reviewed, snippets_rated, seconds_spent), with zeros for days without activity
+# one range read on the (user, day) index, whatever the length (a week chart, a year heatmap)
+def get_daily_activity(user:User, start:datetime.date, end:datetime.date) -> list[dict]:
+    rows = {
+        row['day']: row
+        for row in DailyActivity.objects.filter(user=user, day__range=(start, end)).values(
+            'day', 'words_reviewed', 'snippets_rated', 'seconds_spent'
+        )
+    }
+    days = []
+    day = start
+    while day <= end:
+        days.append(rows.get(day) or {'day': day, 'words_reviewed': 0, 'snippets_rated': 0, 'seconds_spent': 0})
+        day += datetime.timedelta(days=1)
+    return days
@@ -0,0 +1,70 @@
+from django.db.models import Q, OuterRef, Subquery
+from django.utils import timezone
+from django.contrib.auth.models import User
+from frontend.models import VocabPractice
+from shared.models import Word, Meaning, Snippet, VideoStatus
+from frontend.interactors.snippet_practice_payload import deduplicate_meanings
+from frontend.interactors.keyset_cursor import encode_cursor, decode_cursor, convert_cursor_values
+
+# function that returns one page of the user's due words, across all videos, ordered by due date
+# each word comes with its deduplicated meanings and one example snippet from a live video of the frontend
+# pages with a keyset cursor on (due, id), so every page is a range scan on the (user, due) index
+# a cursor that isn't a (due, id) pair starts from the first page
+# runs four queries per page: practices, words with example snippet ids, meanings, snippets
+# returns (words, next_cursor), next_cursor is None on the last page
+def get_due_review_queue(user:User, frontend:str, cursor:str|None=None, limit:int=50):
+    practices = VocabPractice.objects.filter(user=user, due__lte=timezone.now())
+    last = decode_cursor(cursor, 'due_review_queue', 2)
+    if last:
+        last = convert_cursor_values(last, [VocabPractice._meta.get_field('due'), VocabPractice._meta.get_field('id')])
+    if last:
+        last_due, last_id = last
+        practices = practices.filter(Q(due__gt=last_due) | Q(due=last_due, id__gt=last_id))
+    practices = list(practices.order_by('due', 'id').values('id', 'word_id', 'due')[:limit + 1])
+    has_more = len(practices) > limit
+    practices = practices[:limit]
+    word_ids = [practice['word_id'] for practice in practices]
+
+    example_snippet_ids = Snippet.objects.filter(
+        words=OuterRef('pk'),
+        video__status=VideoStatus.LIVE,
+        video__frontend=frontend,
+    ).order_by('id').values('id')[:1]
+    words = {
+        word['id']: word
+        for word in Word.objects.filter(id__in=word_ids).annotate(
+            example_snippet_id=Subquery(example_snippet_ids)
+        ).values('id', 'original_word', 'example_snippet_id')
+    }
+
+    meanings_by_word_id = {}
+    for word_id, en in Meaning.objects.filter(word_id__in=word_ids).values_list('word_id', 'en'):
+        meanings_by_word_id.setdefault(word_id, []).append(en)
+
+    snippets = Snippet.objects.select_related('video').in_bulk(
+        [word['example_snippet_id'] for word in words.values() if word['example_snippet_id']]
+    )
+
+    queue = []
+    for practice in practices:
+        word = words.get(practice['word_id'])
+        if not word:
+            continue
+        snippet = snippets.get(word['example_snippet_id'])
+        queue.append({
+            'id': word['id'],
+            'original_word': word['original_word'],
+            'due': practice['due'].isoformat(),
+            'meanings': deduplicate_meanings(meanings_by_word_id.get(word['id'], [])),
+            'example_snippet': {
+                'id': snippet.id,
+                'content': snippet.content,
+                'youtube_id': snippet.video.youtube_id,
+                'start_time': snippet.start_time,
+                'end_time': snippet.end_time,
+                'url': snippet.get_absolute_url(),
+            } if snippet else None,
+        })
+
+    next_cursor = encode_cursor('due_review_queue', [practices[-1]['due'], practices[-1]['id']]) if has_more else None
+    return queue, next_cursor
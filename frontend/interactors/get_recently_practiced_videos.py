@@ -0,0 +1,24 @@
+from django.contrib.auth.models import User
+from shared.models import Video
+from frontend.models import VideoProgress
+from frontend.interactors.video_progress_touches import get_buffered_video_touches
+
+# function that returns the user's `limit` most recently practiced videos, newest first,
+# each with `last_practiced` attached
+# reads through the write-behind buffer, so videos viewed since the last flush are included
+def get_recently_practiced_videos(user:User, limit:int=3) -> list[Video]:
+    last_practiced = dict(
+        VideoProgress.objects.filter(user=user).order_by('-last_practiced').values_list('video_id', 'last_practiced')[:limit]
+    )
+    for video_id, touched in get_buffered_video_touches(user).items():
+        if video_id not in last_practiced or touched > last_practiced[video_id]:
+            last_practiced[video_id] = touched
+    video_ids = sorted(last_practiced, key=last_practiced.get, reverse=True)[:limit]
+    videos = Video.objects.in_bulk(video_ids)
+    recent_videos = []
+    for video_id in video_ids:
+        if video_id in videos:
+            video = videos[video_id]
+            video.last_practiced = last_practiced[video_id]
+            recent_videos.append(video)
+    return recent_videos
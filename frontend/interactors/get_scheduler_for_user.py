@@ -0,0 +1,11 @@
+from django.contrib.auth.models import User
+from fsrs import Scheduler
+from frontend.models import UserSchedulerParameters
+
+# function that returns the fsrs Scheduler to use for a user:
+# with their fitted parameters (see the fit_scheduler_parameters command) if there are any, the defaults otherwise
+def get_scheduler_for_user(user:User) -> Scheduler:
+    parameters = UserSchedulerParameters.objects.filter(user=user).values_list('parameters', flat=True).first()
+    if parameters:
+        return Scheduler(parameters=parameters)
+    return Scheduler()
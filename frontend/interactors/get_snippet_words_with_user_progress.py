@@ -0,0 +1,28 @@
+from django.utils import timezone
+from django.contrib.auth.models import User
+from frontend.models import VocabPractice
+from shared.models import Snippet
+from frontend.interactors.snippet_practice_payload import get_snippet_practice_payload
+
+# function that takes a snippet and returns all of its words as dicts (id, original_word, meanings),
+# taken from the cached snippet practice payload
+# for the given user, every word gets `is_new` (no VocabPractice yet) and `is_due` set
+# runs a fixed number of queries (payload, practices), no matter how many words the snippet has
+def get_snippet_words_with_user_progress(snippet:Snippet, user:User):
+    words = [dict(word) for word in get_snippet_practice_payload(snippet)]
+    due_by_word_id = dict(
+        VocabPractice.objects.filter(
+            user=user,
+            word_id__in=[word['id'] for word in words]
+        ).values_list('word_id', 'due')
+    )
+    now = timezone.now()
+    for word in words:
+        if word['id'] in due_by_word_id:
+            due = due_by_word_id[word['id']]
+            word['is_new'] = False
+            word['is_due'] = bool(due and due <= now)
+        else:
+            word['is_new'] = True
+            word['is_due'] = True
+    return words
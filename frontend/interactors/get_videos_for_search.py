@@ -1,45 +1,71 @@
-from django.db.models import Q
 from shared.models import Video
-from frontend.models import SearchQuery
+from frontend.interactors.search_query_counter import count_search_query
+from frontend.interactors.video_search_index import search_video_ids
+from frontend.interactors.video_list_cache import get_cached_video_ids, get_cached_live_video_count
+from frontend.interactors.keyset_cursor import encode_cursor, decode_cursor
+from frontend.interactors.keyset_page import get_keyset_page
 from django.utils import timezone
 from django.conf import settings
 
-def get_videos_for_search(search_term=None):
+# The listing of all live videos is ordered by (-added_at, id) and paged by keyset
+LISTING_ORDERING = ['-added_at', 'id']
+
+
+class RankedVideos:
+    """Videos in the order of the given ids, loaded one slice (page) at a time"""
+
+    def __init__(self, video_ids):
+        self.video_ids = video_ids
+
+    def count(self):
+        return len(self.video_ids)
+
+    def __len__(self):
+        return len(self.video_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            ids = self.video_ids[index]
+            videos = Video.objects.in_bulk(ids)
+            return [videos[video_id] for video_id in ids if video_id in videos]
+        return Video.objects.get(id=self.video_ids[index])
+
+
+def _get_ranked_page(ranked_videos:RankedVideos, cursor:str|None, page_size:int):
+    # search hits are a bounded, cached id list, so their cursor is just a position in it
+    position = decode_cursor(cursor, 'ranked_videos', 1)
+    offset = position[0] if position and isinstance(position[0], int) else 0
+    offset = max(offset, 0)
+    videos = ranked_videos[offset:offset + page_size]
+    next_cursor = encode_cursor('ranked_videos', [offset + page_size]) if offset + page_size < len(ranked_videos) else None
+    previous_cursor = encode_cursor('ranked_videos', [max(offset - page_size, 0)]) if offset > 0 else None
+    return videos, next_cursor, previous_cursor
+
+
+def get_videos_for_search(search_term=None, cursor=None, page_size=20):
     """
-    Search videos by title, channel, tags, or comments.
-    Returns a tuple of (videos_queryset, total_count)
+    Search videos by title, channel or tags, through the full-text search index.
+    Returns a tuple of (videos, total_count, next_cursor, previous_cursor) for one page:
+    without a search term all live videos, newest first, paged by keyset,
+    otherwise the ranked hits, paged through their cached id list.
     """
     # Get the current frontend language
     language_code = getattr(settings, 'LANGUAGE_TO_LEARN', 'de')
     frontend_value = language_code  # 'de' or 'ar'
 
     if not search_term:
-        videos = Video.objects.filter(
+        live_videos = Video.objects.filter(
             status='live',
             frontend=frontend_value
-        ).order_by('-added_at')
-        return videos, videos.count()
-
-    # Create search query record
-    search_query, created = SearchQuery.objects.get_or_create(term=search_term)
-    search_query.count += 1
-    search_query.save()
-
-    # Build search query
-    search_query_obj = Q()
-    for term in search_term.split():
-        search_query_obj |= (
-            Q(youtube_title__icontains=term) |
-            Q(channel_name__icontains=term) |
-            Q(comment__icontains=term) |
-            Q(tags__name__icontains=term)
         )
+        videos, next_cursor, previous_cursor = get_keyset_page(live_videos, LISTING_ORDERING, cursor, page_size)
+        total_count = get_cached_live_video_count(frontend_value, live_videos.count)
+        return videos, total_count, next_cursor, previous_cursor
 
-    videos = Video.objects.filter(
-        search_query_obj,
-        status='live',
-        frontend=frontend_value
-    ).distinct().order_by('-added_at')
-
-    total_count = videos.count()
-    return videos, total_count
+    # Count the search (buffered, written in the background)
+    count_search_query(search_term)
+    ranked_videos = RankedVideos(
+        get_cached_video_ids(frontend_value, search_term, lambda: search_video_ids(frontend_value, search_term))
+    )
+    videos, next_cursor, previous_cursor = _get_ranked_page(ranked_videos, cursor, page_size)
+    return videos, ranked_videos.count(), next_cursor, previous_cursor
@@ -0,0 +1,26 @@
+from django.db.models import Q
+from frontend.models import VocabReviewLog
+
+# generator that streams the whole VocabReviewLog in (user, id) order, chunk by chunk,
+# using keyset pagination on the (user, id) index instead of OFFSET
+# yields (user_id, [(word_id, rating, reviewed_at), ...]) once per user
+def iter_vocab_review_logs_by_user(chunk_size:int=10000):
+    last_user_id, last_id = 0, 0
+    current_user_id, current_reviews = None, []
+    while True:
+        rows = list(
+            VocabReviewLog.objects.filter(
+                Q(user_id__gt=last_user_id) | Q(user_id=last_user_id, id__gt=last_id)
+            ).order_by('user_id', 'id').values_list('user_id', 'id', 'word_id', 'rating', 'reviewed_at')[:chunk_size]
+        )
+        if not rows:
+            break
+        for user_id, id, word_id, rating, reviewed_at in rows:
+            if user_id != current_user_id:
+                if current_reviews:
+                    yield current_user_id, current_reviews
+                current_user_id, current_reviews = user_id, []
+            current_reviews.append((word_id, rating, reviewed_at))
+        last_user_id, last_id = rows[-1][0], rows[-1][1]
+    if current_reviews:
+        yield current_user_id, current_reviews
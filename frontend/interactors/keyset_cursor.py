@@ -0,0 +1,46 @@
+from datetime import datetime
+from django.core import signing
+from django.core.exceptions import ValidationError
+
+# Opaque cursors for keyset ("seek") pagination: the sort key values of the last row of a page.
+# Cursors are signed, so a client can hand one back but not make up its own; a cursor that is malformed
+# or doesn't match its signature counts as no cursor. Each cursor carries its kind (which listing it pages),
+# and is only decoded by a listing of the same kind and with the expected number of values, so a cursor
+# of another listing counts as no cursor too. Still, check the values against the model fields
+# they're compared with (convert_cursor_values) before they end up in a query.
+# Datetimes are supported as sort key values (they're tagged, so they come back as datetimes).
+
+SALT = 'frontend.keyset_cursor'
+
+
+def encode_cursor(kind:str, values:list) -> str:
+    serializable = [{'dt': value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return signing.dumps([kind, *serializable], salt=SALT)
+
+
+def decode_cursor(cursor:str|None, kind:str, length:int) -> list|None:
+    """Returns the cursor's `length` values, or None for a missing, malformed or forged cursor
+    or one of another kind or length (= start from the beginning)"""
+    if not cursor:
+        return None
+    try:
+        cursor_kind, *values = signing.loads(cursor, salt=SALT)
+        if cursor_kind != kind or len(values) != length:
+            return None
+        return [datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value for value in values]
+    except (signing.BadSignature, ValueError, TypeError, KeyError):
+        return None
+
+
+def convert_cursor_values(values:list, fields:list) -> list|None:
+    """The cursor values converted by the model fields they belong to (one value per field), or None if they don't fit"""
+    if len(values) != len(fields):
+        return None
+    try:
+        converted = [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, ValueError, TypeError):
+        return None
+    # sort key fields are non-null, and None can't be compared with in a query
+    if any(value is None for value in converted):
+        return None
+    return converted
@@ -0,0 +1,64 @@
+from django.db.models import Q
+from frontend.interactors.keyset_cursor import encode_cursor, decode_cursor, convert_cursor_values
+
+# Keyset ("seek") pagination for querysets: a page starts right after (or ends right before) the sort key
+# of a row of the previous page, so every page is one indexed range query, no COUNT and no OFFSET.
+# `ordering` must be a total order over non-null fields (end it with a unique field), e.g. ['-added_at', 'id'].
+# Cursors are opaque (see keyset_cursor) and carry the direction: ['next' | 'prev', *sort key values];
+# a cursor whose values don't fit the ordering's fields starts from the first page.
+
+
+def _field_name(field):
+    return field.lstrip('-')
+
+
+def _seek_filter(ordering, values, forward):
+    """Rows after (forward) or before the given sort key in the ordering"""
+    seek = Q()
+    for i, field in enumerate(ordering):
+        lookup = 'lt' if field.startswith('-') == forward else 'gt'
+        clause = Q(**{f'{_field_name(field)}__{lookup}': values[i]})
+        for previous_field, previous_value in zip(ordering[:i], values[:i]):
+            clause &= Q(**{_field_name(previous_field): previous_value})
+        seek |= clause
+    return seek
+
+
+def _sort_key(item, ordering):
+    return [getattr(item, _field_name(field)) for field in ordering]
+
+
+def _cursor_kind(queryset, ordering):
+    # a cursor only fits listings of the same model and ordering
+    return f"keyset {queryset.model._meta.label} {','.join(ordering)}"
+
+
+def get_keyset_page(queryset, ordering:list[str], cursor:str|None, page_size:int):
+    """Returns (items, next_cursor, previous_cursor); the cursors are None at the ends"""
+    kind = _cursor_kind(queryset, ordering)
+    position = decode_cursor(cursor, kind, len(ordering) + 1)
+    if position and position[0] in ('next', 'prev'):
+        fields = [queryset.model._meta.get_field(_field_name(field)) for field in ordering]
+        values = convert_cursor_values(position[1:], fields)
+        position = [position[0], *values] if values is not None else None
+    else:
+        position = None
+
+    if position is None or position[0] == 'next':
+        if position is not None:
+            queryset = queryset.filter(_seek_filter(ordering, position[1:], forward=True))
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+        items = rows[:page_size]
+        has_next = len(rows) > page_size
+        has_previous = position is not None
+    else:
+        reversed_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        queryset = queryset.filter(_seek_filter(ordering, position[1:], forward=False))
+        rows = list(queryset.order_by(*reversed_ordering)[:page_size + 1])
+        items = rows[:page_size][::-1]
+        has_next = True
+        has_previous = len(rows) > page_size
+
+    next_cursor = encode_cursor(kind, ['next', *_sort_key(items[-1], ordering)]) if items and has_next else None
+    previous_cursor = encode_cursor(kind, ['prev', *_sort_key(items[0], ordering)]) if items and has_previous else None
+    return items, next_cursor, previous_cursor
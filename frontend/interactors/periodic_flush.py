@@ -0,0 +1,65 @@
+import atexit
+import logging
+import threading
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Background flushing for the write-behind buffers (video progress touches, search query counts):
+# one daemon thread per flush function and process, started on first use,
+# calling the flush function every `interval` seconds and once more when the process exits
+# (atexit, and gunicorn's worker_exit hook in gunicorn.conf.py, which calls flush_all).
+# A process that is killed outright (SIGKILL, a worker timeout) loses what it buffered since the last flush.
+
+_threads = {}
+_lock = threading.Lock()
+
+
+def _run_flush(flush):
+    try:
+        flush()
+    except Exception:
+        logger.exception("Periodic flush %s failed", flush.__name__)
+    finally:
+        # the flushing thread has its own db connection; don't keep it open between flushes
+        connection.close()
+
+
+def _flush_periodically(flush, interval:float, stop:threading.Event):
+    while not stop.wait(interval):
+        _run_flush(flush)
+
+
+def _flush_at_exit(flush, stop:threading.Event):
+    stop.set()
+    try:
+        flush()
+    except Exception:
+        logger.exception("Flush %s at exit failed", flush.__name__)
+
+
+def ensure_periodic_flush(flush, interval:float):
+    """Make sure this process runs `flush` every `interval` seconds in the background"""
+    thread = _threads.get(flush)
+    if thread is not None and thread.is_alive():
+        return
+    with _lock:
+        thread = _threads.get(flush)
+        if thread is not None and thread.is_alive():
+            return
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=_flush_periodically,
+            args=(flush, interval, stop),
+            name=f'periodic-flush-{flush.__name__}',
+            daemon=True,
+        )
+        thread.start()
+        _threads[flush] = thread
+        atexit.register(_flush_at_exit, flush, stop)
+
+
+def flush_all():
+    """Run every flush function this process has started right away, e.g. before it exits"""
+    for flush in list(_threads):
+        _run_flush(flush)
@@ -0,0 +1,21 @@
+from django.db.models import F
+from django.utils import timezone
+from django.contrib.auth.models import User
+from frontend.models import DailyActivity
+
+# A practice session longer than this is someone who left the tab open
+MAX_SECONDS_PER_SESSION = 60 * 60
+
+
+# function that adds to the user's DailyActivity of today
+# call it inside the transaction that saves the practice, so the rollup never disagrees with it
+# (insert the row if it's missing, then increment in the db, so concurrent requests add up)
+def record_daily_activity(user:User, words_reviewed:int=0, snippets_rated:int=0, seconds_spent:int=0):
+    day = timezone.localdate()
+    seconds_spent = min(max(int(seconds_spent), 0), MAX_SECONDS_PER_SESSION)
+    DailyActivity.objects.bulk_create([DailyActivity(user=user, day=day)], ignore_conflicts=True)
+    DailyActivity.objects.filter(user=user, day=day).update(
+        words_reviewed=F('words_reviewed') + words_reviewed,
+        snippets_rated=F('snippets_rated') + snippets_rated,
+        seconds_spent=F('seconds_spent') + seconds_spent,
+    )
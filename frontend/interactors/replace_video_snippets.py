@@ -0,0 +1,27 @@
+from django.db import transaction
+from shared.models import Video, VideoStatus, Snippet
+from frontend.interactors.snippet_practice_payload import invalidate_snippet_practice_payloads_for_video
+from frontend.interactors.reset_video_progress_summaries import reset_video_progress_summaries
+from frontend.interactors.snippet_timeline import compute_snippet_timeline
+
+# function that replaces all snippets of a video with new ones built from transcript segments
+# (anything with text, start and duration, e.g. the fetched youtube_transcript_api snippets)
+# all snippets are built in memory first and inserted with one bulk_create; deleting the old ones
+# (their words' links and SnippetPractices go with them), resetting the users' progress summaries
+# and storing the new timeline and status happen in the same transaction,
+# so the video ends up with either the complete new snippet set or its old one
+def replace_video_snippets(video:Video, segments, status:str=VideoStatus.SNIPPETS_GENERATED) -> list[Snippet]:
+    snippets = [
+        Snippet(video=video, index=index, content=segment.text, start=segment.start, duration=segment.duration)
+        for index, segment in enumerate(segments)
+    ]
+    # Looks the old snippets up, so before deleting them
+    invalidate_snippet_practice_payloads_for_video(video)
+    with transaction.atomic():
+        reset_video_progress_summaries(video)
+        video.snippets.all().delete()
+        Snippet.objects.bulk_create(snippets, batch_size=500)
+        video.snippet_timeline = compute_snippet_timeline(snippets)
+        video.status = status
+        video.save()
+    return snippets
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+import numpy as np
+from fsrs import Scheduler, State
+# not part of fsrs' public API (the package exports no interval math), which is why requirements.txt
+# pins fsrs: when upgrading, check these against fsrs.fsrs and run the scheduler parity tests in frontend/tests.py
+from fsrs.fsrs import DECAY, FACTOR, FUZZ_RANGES
+from frontend.models import VocabPractice
+
+# NumPy versions of the fsrs Scheduler's interval math, so that whole chunks of
+# VocabPractice rows can be rescheduled at once instead of card by card.
+# Only cards in the Review state are rescheduled: Learning/Relearning cards sit on
+# short (minute) steps that don't depend on the scheduler's retention or parameters.
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+
+def next_intervals(stability:np.ndarray, scheduler:Scheduler) -> np.ndarray:
+    """Vectorized Scheduler._next_interval: full days, at least 1, at most maximum_interval"""
+    intervals = (stability / FACTOR) * ((scheduler.desired_retention ** (1 / DECAY)) - 1)
+    intervals = np.rint(intervals)
+    return np.clip(intervals, 1, scheduler.maximum_interval).astype(np.int64)
+
+
+def fuzz_intervals(intervals:np.ndarray, scheduler:Scheduler, rng:np.random.Generator) -> np.ndarray:
+    """Vectorized Scheduler._get_fuzzed_interval: intervals shorter than 2.5 days stay as they are"""
+    delta = np.ones(intervals.shape)
+    for fuzz_range in FUZZ_RANGES:
+        delta += fuzz_range["factor"] * np.maximum(
+            np.minimum(intervals, fuzz_range["end"]) - fuzz_range["start"], 0.0
+        )
+    max_ivl = np.minimum(np.rint(intervals + delta), scheduler.maximum_interval)
+    min_ivl = np.minimum(np.maximum(2, np.rint(intervals - delta)), max_ivl)
+    fuzzed = np.minimum(np.rint(rng.random(intervals.shape) * (max_ivl - min_ivl + 1) + min_ivl), scheduler.maximum_interval)
+    return np.where(intervals < 2.5, intervals, fuzzed).astype(np.int64)
+
+
+def retrievabilities(stability:np.ndarray, elapsed_days:np.ndarray) -> np.ndarray:
+    """Vectorized Card.get_retrievability"""
+    return (1 + FACTOR * np.maximum(elapsed_days, 0) / stability) ** DECAY
+
+
+def _to_datetime64(datetimes):
+    # stored datetimes are UTC, numpy wants them naive
+    return np.array([dt.replace(tzinfo=None) for dt in datetimes], dtype='datetime64[us]')
+
+
+def _from_datetime64(values):
+    return [dt.replace(tzinfo=timezone.utc) for dt in values.astype(datetime)]
+
+
+# function that recomputes `due` for every Review-state VocabPractice in the queryset with the given scheduler
+# streams the rows in primary-key chunks (no OFFSET), does the math per chunk as arrays
+# and writes each chunk back with one bulk_update
+# returns the number of rescheduled cards, how many of them are due now, and their mean retrievability
+def reschedule_vocab_practices(scheduler:Scheduler, queryset=None, chunk_size:int=5000, dry_run:bool=False, seed:int|None=None, progress=None):
+    if queryset is None:
+        queryset = VocabPractice.objects.all()
+    queryset = queryset.filter(
+        state=State.Review.name,
+        stability__isnull=False,
+        last_review__isnull=False,
+    ).order_by('id')
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 'us')
+
+    rescheduled_count = 0
+    due_count = 0
+    retrievability_sum = 0.0
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).values_list('id', 'stability', 'last_review')[:chunk_size])
+        if not rows:
+            break
+        ids, stability, last_review = zip(*rows)
+        last_id = ids[-1]
+
+        stability = np.array(stability, dtype=np.float64)
+        last_review = _to_datetime64(last_review)
+
+        intervals = next_intervals(stability, scheduler)
+        if scheduler.enable_fuzzing:
+            intervals = fuzz_intervals(intervals, scheduler, rng)
+        due = last_review + intervals * ONE_DAY
+
+        elapsed_days = (now - last_review) // ONE_DAY
+        retrievability_sum += float(retrievabilities(stability, elapsed_days).sum())
+        due_count += int((due <= now).sum())
+        rescheduled_count += len(ids)
+
+        if not dry_run:
+            VocabPractice.objects.bulk_update(
+                [VocabPractice(id=id, due=due_at) for id, due_at in zip(ids, _from_datetime64(due))],
+                ['due'],
+                batch_size=1000,
+            )
+        if progress:
+            progress(rescheduled_count)
+
+    return {
+        'rescheduled': rescheduled_count,
+        'due_now': due_count,
+        'mean_retrievability': retrievability_sum / rescheduled_count if rescheduled_count else None,
+    }
@@ -0,0 +1,7 @@
+from shared.models import Video
+from frontend.models import VideoProgress
+
+# function that clears the snippet progress summary on every VideoProgress of a video
+# needed whenever the video's snippets get deleted (their SnippetPractices go with them)
+def reset_video_progress_summaries(video:Video):
+    VideoProgress.objects.filter(video=video).update(rated_snippet_count=0, snippet_difficulties={})
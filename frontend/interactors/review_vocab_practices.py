@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.contrib.auth.models import User
+from fsrs import Card, State, Rating
+from frontend.models import VocabPractice, VocabReviewLog
+from frontend.interactors.get_scheduler_for_user import get_scheduler_for_user
+from frontend.interactors.record_daily_activity import record_daily_activity
+
+VOCAB_PRACTICE_CARD_FIELDS = ['state', 'step', 'stability', 'difficulty', 'due', 'last_review']
+
+
+def card_from_vocab_practice(practice:VocabPractice) -> Card:
+    """Recreate the fsrs Card from a stored VocabPractice"""
+    return Card(
+        state=State[practice.state] if practice.state else State.Learning,
+        step=practice.step,
+        stability=practice.stability,
+        difficulty=practice.difficulty,
+        due=practice.due,
+        last_review=practice.last_review,
+    )
+
+
+# function that takes a user and their ratings ({word_id: Rating}) from one practice session
+# and runs them through the fsrs Scheduler as one batch:
+# one query to load the existing practices, one upsert to write all of them back
+# and one insert appending the ratings to the VocabReviewLog, in one transaction
+# that also adds the session (words, seconds_spent) to the user's DailyActivity
+# (the upsert on (user, word) also keeps concurrent double-submits from breaking unique_together)
+def review_vocab_practices(user:User, ratings:dict[int, Rating], seconds_spent:int=0) -> list[VocabPractice]:
+    if not ratings:
+        return []
+    scheduler = get_scheduler_for_user(user)
+    with transaction.atomic():
+        existing = {
+            practice.word_id: practice
+            for practice in VocabPractice.objects.select_for_update().filter(user=user, word_id__in=ratings.keys())
+        }
+        practices = []
+        review_logs = []
+        for word_id, rating in ratings.items():
+            previous = existing.get(word_id)
+            card = card_from_vocab_practice(previous) if previous else Card()
+            card, _ = scheduler.review_card(card, rating)
+            review_logs.append(VocabReviewLog(
+                user=user,
+                word_id=word_id,
+                rating=int(rating),
+                reviewed_at=card.last_review,
+                elapsed_days=(card.last_review - previous.last_review).days if previous and previous.last_review else None,
+            ))
+            # Unsaved instances on purpose: bulk_create inserts new words and updates existing ones
+            practices.append(VocabPractice(
+                user=user,
+                word_id=word_id,
+                state=card.state.name if card.state else "Learning",
+                step=card.step,
+                stability=card.stability,
+                difficulty=card.difficulty,
+                due=card.due,
+                last_review=card.last_review,
+            ))
+        VocabPractice.objects.bulk_create(
+            practices,
+            update_conflicts=True,
+            unique_fields=['user', 'word'],
+            update_fields=VOCAB_PRACTICE_CARD_FIELDS + ['updated'],
+        )
+        VocabReviewLog.objects.bulk_create(review_logs)
+        record_daily_activity(user, words_reviewed=len(practices), seconds_spent=seconds_spent)
+    return practices
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.utils import timezone
+from django.contrib.auth.models import User
+from shared.models import Snippet
+from frontend.models import SnippetPractice, VideoProgress
+from frontend.interactors.record_daily_activity import record_daily_activity
+
+# function that saves a user's rating of a snippet,
+# and in the same transaction updates the summary on the user's VideoProgress for the snippet's video
+# (rated snippet count, per-snippet difficulties), which the video page renders from,
+# and the user's DailyActivity (watching the snippet counts as its duration of time spent)
+def save_snippet_rating(user:User, snippet:Snippet, perceived_difficulty:int) -> SnippetPractice:
+    with transaction.atomic():
+        practice, _ = SnippetPractice.objects.get_or_create(
+            user=user,
+            snippet=snippet
+        )
+        practice.perceived_difficulty = perceived_difficulty
+        practice.updated = timezone.now()
+        practice.save()
+
+        video_progress, _ = VideoProgress.objects.select_for_update().get_or_create(
+            user=user,
+            video_id=snippet.video_id,
+        )
+        key = str(snippet.id)
+        if key not in video_progress.snippet_difficulties:
+            video_progress.rated_snippet_count += 1
+        video_progress.snippet_difficulties[key] = perceived_difficulty
+        video_progress.save(update_fields=['rated_snippet_count', 'snippet_difficulties'])
+        record_daily_activity(user, snippets_rated=1, seconds_spent=round(snippet.duration))
+    return practice
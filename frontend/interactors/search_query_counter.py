@@ -0,0 +1,51 @@
+import threading
+from collections import Counter
+from django.db import transaction
+from django.db.models import F
+from frontend.models import SearchQuery
+from frontend.interactors.periodic_flush import ensure_periodic_flush
+
+# Accumulates search term counts in this process and adds them to SearchQuery in the background
+# (see periodic_flush), so searching does no db writes.
+# The flush increments with UPDATE ... count = count + n, so counts from concurrent processes add up exactly;
+# if a flush fails, its counts go back into the buffer for the next one.
+# The buffer is flushed once more when the process exits, but a process that is killed outright loses
+# the searches of its last FLUSH_INTERVAL seconds: the counts are exact up to that, not to the last search.
+FLUSH_INTERVAL = 30
+
+_counts = Counter()
+_lock = threading.Lock()
+
+
+def count_search_query(search_term:str):
+    """Count one search for the term; written to SearchQuery on the next flush"""
+    term = search_term[:SearchQuery._meta.get_field('term').max_length]
+    with _lock:
+        _counts[term] += 1
+    ensure_periodic_flush(flush_search_query_counts, FLUSH_INTERVAL)
+
+
+def flush_search_query_counts() -> int:
+    """Add the buffered counts to SearchQuery; returns the number of counted searches"""
+    with _lock:
+        counts = Counter(_counts)
+        _counts.clear()
+    if not counts:
+        return 0
+    try:
+        with transaction.atomic():
+            SearchQuery.objects.bulk_create(
+                [SearchQuery(term=term, count=0) for term in counts],
+                ignore_conflicts=True,
+            )
+            # one UPDATE per distinct increment (mostly just a few: 1, 2, 3, ...)
+            terms_by_increment = {}
+            for term, increment in counts.items():
+                terms_by_increment.setdefault(increment, []).append(term)
+            for increment, terms in terms_by_increment.items():
+                SearchQuery.objects.filter(term__in=terms).update(count=F('count') + increment)
+    except Exception:
+        with _lock:
+            _counts.update(counts)
+        raise
+    return counts.total()
@@ -0,0 +1,92 @@
+import datetime
+from django.contrib.auth.models import User
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from frontend.models import DailyActivity, DailySiteStatistics, VideoProgress, VocabPractice
+
+# Site-wide activity per day for the CMS statistics page.
+# Every metric is one grouped query (TruncDate + GROUP BY) over a datetime range, which the
+# indexes of migration frontend 0012 can serve, so the number of queries doesn't depend on the range.
+# Finished days are rolled up into DailySiteStatistics (rollup_site_statistics command, nightly);
+# get_site_statistics only counts the days without a rollup (normally just today) live.
+# logins and videos_practiced come from last_login/last_practiced, which only keep the latest
+# visit: a rollup written right after the day freezes the count, a late backfill undercounts.
+# words_practiced is summed from DailyActivity; days without any DailyActivity rows (before it existed)
+# count the words whose last review was on that day, as the statistics page did before the rollup.
+
+SITE_STATISTICS_FIELDS = ['logins', 'registrations', 'videos_practiced', 'words_practiced']
+
+
+def _day_start(day:datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _count_per_day(queryset, field:str, start:datetime.date, end:datetime.date) -> dict:
+    rows = queryset.filter(**{
+        f'{field}__gte': _day_start(start),
+        f'{field}__lt': _day_start(end + datetime.timedelta(days=1)),
+    }).annotate(day=TruncDate(field)).values('day').annotate(count=Count('id')).order_by()
+    return {row['day']: row['count'] for row in rows}
+
+
+def count_site_statistics(start:datetime.date, end:datetime.date) -> dict:
+    """Count every metric for the days from start to end (inclusive): {day: {field: count}},
+    one query per metric (and one more for words_practiced of days before DailyActivity)"""
+    words_practiced = {
+        row['day']: row['count']
+        for row in DailyActivity.objects.filter(day__range=(start, end)).values('day').annotate(
+            count=Sum('words_reviewed')
+        ).order_by()
+    }
+    days = []
+    day = start
+    while day <= end:
+        days.append(day)
+        day += datetime.timedelta(days=1)
+    days_without_activity = [day for day in days if day not in words_practiced]
+    if days_without_activity:
+        last_reviews = _count_per_day(VocabPractice.objects.all(), 'last_review', days_without_activity[0], days_without_activity[-1])
+        words_practiced.update({day: last_reviews.get(day, 0) for day in days_without_activity})
+    per_field = {
+        'logins': _count_per_day(User.objects.all(), 'last_login', start, end),
+        'registrations': _count_per_day(User.objects.all(), 'date_joined', start, end),
+        'videos_practiced': _count_per_day(VideoProgress.objects.all(), 'last_practiced', start, end),
+        'words_practiced': words_practiced,
+    }
+    statistics = {}
+    for day in days:
+        statistics[day] = {field: per_field[field].get(day) or 0 for field in SITE_STATISTICS_FIELDS}
+    return statistics
+
+
+def rollup_site_statistics(start:datetime.date, end:datetime.date) -> int:
+    """Count the days from start to end (inclusive) and upsert them into DailySiteStatistics; returns the number of days"""
+    statistics = count_site_statistics(start, end)
+    DailySiteStatistics.objects.bulk_create(
+        [DailySiteStatistics(day=day, **counts) for day, counts in statistics.items()],
+        update_conflicts=True,
+        unique_fields=['day'],
+        update_fields=SITE_STATISTICS_FIELDS + ['updated_at'],
+    )
+    return len(statistics)
+
+
+def get_site_statistics(start:datetime.date, end:datetime.date) -> list[dict]:
+    """Every day from start to end (inclusive), oldest first, as dicts (day, *SITE_STATISTICS_FIELDS):
+    rolled up days are read from DailySiteStatistics, today and any day without a rollup are counted live"""
+    today = timezone.localdate()
+    rolled_up = {
+        row['day']: row
+        for row in DailySiteStatistics.objects.filter(day__range=(start, min(end, today - datetime.timedelta(days=1)))).values(
+            'day', *SITE_STATISTICS_FIELDS
+        )
+    }
+    days = []
+    day = start
+    while day <= end:
+        days.append(day)
+        day += datetime.timedelta(days=1)
+    missing = [day for day in days if day not in rolled_up]
+    live = count_site_statistics(missing[0], missing[-1]) if missing else {}
+    return [rolled_up.get(day) or {'day': day, **live[day]} for day in days]
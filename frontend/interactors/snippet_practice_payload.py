@@ -0,0 +1,75 @@
+import re
+from django.core.cache import cache
+from shared.models import Snippet, Video, Word
+
+# The user-independent part of the practice page: for each word of a snippet,
+# its id, original_word and deduplicated meanings.
+# Built once per snippet and kept in the cache until the snippet's words/meanings change.
+# Bump PAYLOAD_VERSION whenever the payload format changes; old entries are then simply ignored.
+PAYLOAD_VERSION = 1
+
+
+def _cache_key(snippet_id):
+    return f"snippet_practice_payload:v{PAYLOAD_VERSION}:{snippet_id}"
+
+
+def deduplicate_meanings(meanings):
+    """Deduplicate meanings based on various criteria:
+    - Remove exact duplicates
+    - Remove case-insensitive duplicates
+    - Remove duplicates that only differ by parenthetical content
+    """
+    seen = set()
+    unique_meanings = []
+
+    for meaning in meanings:
+        # Remove content in parentheses for comparison
+        base_meaning = re.sub(r'\([^)]*\)', '', meaning).strip()
+        # Convert to lowercase for case-insensitive comparison
+        normalized = base_meaning.lower()
+
+        if normalized not in seen:
+            seen.add(normalized)
+            unique_meanings.append(meaning)
+
+    return unique_meanings
+
+
+def build_snippet_practice_payload(snippet_id):
+    """Build the payload for a snippet from the db and store it in the cache"""
+    words = Word.objects.filter(occurs_in_snippets__id=snippet_id).prefetch_related('meanings')
+    payload = [
+        {
+            'id': word.id,
+            'original_word': word.original_word,
+            'meanings': deduplicate_meanings([meaning.en for meaning in word.meanings.all()]),
+        }
+        for word in words
+    ]
+    cache.set(_cache_key(snippet_id), payload, None)
+    return payload
+
+
+def get_snippet_practice_payload(snippet:Snippet):
+    """Cached payload for the snippet, built on first access"""
+    payload = cache.get(_cache_key(snippet.id))
+    if payload is None:
+        payload = build_snippet_practice_payload(snippet.id)
+    return payload
+
+
+def invalidate_snippet_practice_payloads_for_video(video:Video):
+    """Drop the payloads of the video's snippets, and of every other snippet sharing a word with them
+    (words and their meanings are shared across videos)"""
+    snippet_ids = set(video.snippets.values_list('id', flat=True))
+    snippet_ids.update(
+        Snippet.objects.filter(words__occurs_in_snippets__video=video).values_list('id', flat=True)
+    )
+    cache.delete_many([_cache_key(snippet_id) for snippet_id in snippet_ids])
+
+
+def refresh_snippet_practice_payloads_for_video(video:Video):
+    """Invalidate everything the video's words touch, then rebuild the video's own snippets right away"""
+    invalidate_snippet_practice_payloads_for_video(video)
+    for snippet_id in video.snippets.values_list('id', flat=True):
+        build_snippet_practice_payload(snippet_id)
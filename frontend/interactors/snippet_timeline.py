@@ -0,0 +1,40 @@
+from shared.models import Video
+
+# The snippet timeline on the video page: one bar per snippet, positioned in % of the video's length.
+# Computed once when snippets are generated and stored on the video, so rendering it needs no queries.
+
+
+def compute_snippet_timeline(snippets) -> dict:
+    """Takes the snippets in order; each bar starts where the previous snippet ended"""
+    snippets = list(snippets)
+    if not snippets:
+        return {}
+    duration = snippets[-1].end_time
+    bars = []
+    previous_end_time = None
+    for snippet in snippets:
+        left = (previous_end_time / duration) * 100 if previous_end_time is not None else 0
+        width = ((snippet.end_time - snippet.start_time) / duration) * 100
+        bars.append([round(left, 4), round(width, 4)])
+        previous_end_time = snippet.end_time
+    return {'duration': duration, 'bars': bars}
+
+
+def update_snippet_timeline(video:Video) -> dict:
+    """(Re)compute the video's timeline from its current snippets and store it"""
+    video.snippet_timeline = compute_snippet_timeline(video.snippets.all())
+    Video.objects.filter(id=video.id).update(snippet_timeline=video.snippet_timeline)
+    return video.snippet_timeline
+
+
+def attach_snippet_timeline(video:Video, snippets) -> dict:
+    """Sets timeline_left/timeline_width on each of the (already loaded) snippets
+    falls back to recomputing, if the stored timeline is missing or doesn't match the snippets"""
+    timeline = video.snippet_timeline
+    if len(timeline.get('bars', [])) != len(snippets):
+        timeline = compute_snippet_timeline(snippets)
+        Video.objects.filter(id=video.id).update(snippet_timeline=timeline)
+    for snippet, (left, width) in zip(snippets, timeline.get('bars', [])):
+        snippet.timeline_left = left
+        snippet.timeline_width = width
+    return timeline
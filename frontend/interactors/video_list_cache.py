@@ -0,0 +1,49 @@
+import hashlib
+import time
+from django.core.cache import cache
+from frontend.interactors.video_search_index import search_terms
+
+# Ordered video id lists of learner searches, and the number of live videos, cached per
+# (frontend, catalogue version, normalized search term); a search page then only fetches its own rows by id.
+# The catalogue version of a frontend changes whenever one of its videos goes live, stops being live,
+# or a live video's searchable metadata changes (see cms' notify_videos_changed),
+# which makes all of the frontend's cached lists unreachable at once; they then just expire.
+VIDEO_LIST_TIMEOUT = 60 * 60
+
+
+def _version_key(frontend):
+    return f"video_catalogue_version:{frontend}"
+
+
+def get_catalogue_version(frontend:str) -> int:
+    key = _version_key(frontend)
+    version = cache.get(key)
+    if version is None:
+        # a timestamp, not a counter: if the version gets evicted, it must not come back as an old value
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_catalogue_versions(frontends):
+    """Invalidate the cached video lists of the given frontends"""
+    version = time.time_ns()
+    cache.set_many({_version_key(frontend): version for frontend in set(frontends)}, None)
+
+
+def get_cached_video_ids(frontend:str, search_term:str, compute_video_ids) -> list[int]:
+    """The cached id list for the frontend and search term, computed with compute_video_ids() on a miss"""
+    normalized_term = ' '.join(search_terms(search_term, frontend))
+    term_hash = hashlib.md5(normalized_term.encode()).hexdigest()
+    key = f"video_list_ids:{frontend}:{get_catalogue_version(frontend)}:{term_hash}"
+    video_ids = cache.get(key)
+    if video_ids is None:
+        video_ids = list(compute_video_ids())
+        cache.set(key, video_ids, VIDEO_LIST_TIMEOUT)
+    return video_ids
+
+
+def get_cached_live_video_count(frontend:str, compute_count) -> int:
+    """The cached number of live videos of the frontend, computed with compute_count() on a miss"""
+    key = f"video_list_count:{frontend}:{get_catalogue_version(frontend)}"
+    return cache.get_or_set(key, compute_count, VIDEO_LIST_TIMEOUT)
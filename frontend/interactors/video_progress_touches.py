@@ -0,0 +1,63 @@
+import threading
+from django.utils import timezone
+from django.contrib.auth.models import User
+from shared.models import Video
+from frontend.models import VideoProgress
+from frontend.interactors.periodic_flush import ensure_periodic_flush
+
+# Write-behind buffer for VideoProgress.last_practiced.
+# Viewing a video only records the touch in this process' buffer; a background thread (see periodic_flush)
+# writes all buffered touches every FLUSH_INTERVAL seconds as one bulk upsert
+# (and once more when the process exits: atexit, and gunicorn's worker_exit hook),
+# instead of one write transaction per page view.
+# Reads of last_practiced (dashboard, recent videos, the video_progress endpoint) merge in
+# get_buffered_video_touches, so the viewing user sees their own touches of this process right away.
+# Other processes see them after the next flush, so their last_practiced can be up to FLUSH_INTERVAL seconds old.
+# A killed process loses at most FLUSH_INTERVAL seconds of touches, which only ever
+# makes a last_practiced slightly older than it should be.
+FLUSH_INTERVAL = 10
+
+_touches = {}  # {(user_id, video_id): datetime}
+_lock = threading.Lock()
+
+
+def touch_video_progress(user:User, video:Video):
+    """Record that the user viewed the video now; written to VideoProgress on the next flush"""
+    with _lock:
+        _touches[(user.id, video.id)] = timezone.now()
+    ensure_periodic_flush(flush_video_progress_touches, FLUSH_INTERVAL)
+
+
+def get_buffered_video_touches(user:User) -> dict:
+    """The user's touches that are not flushed yet: {video_id: last_practiced}"""
+    with _lock:
+        return {video_id: touched for (user_id, video_id), touched in _touches.items() if user_id == user.id}
+
+
+def flush_video_progress_touches() -> int:
+    """Write all buffered touches as one upsert on (user, video); returns the number of written touches.
+    The touches stay in the buffer (and readable) until the upsert succeeded; if it fails, the next flush retries them"""
+    with _lock:
+        touches = dict(_touches)
+    if not touches:
+        return 0
+    # users (guests) or videos may have been deleted since the touch; one bad row would fail the whole upsert
+    user_ids = set(User.objects.filter(id__in={user_id for user_id, _ in touches}).values_list('id', flat=True))
+    video_ids = set(Video.objects.filter(id__in={video_id for _, video_id in touches}).values_list('id', flat=True))
+    progresses = [
+        VideoProgress(user_id=user_id, video_id=video_id, last_practiced=touched)
+        for (user_id, video_id), touched in touches.items()
+        if user_id in user_ids and video_id in video_ids
+    ]
+    VideoProgress.objects.bulk_create(
+        progresses,
+        update_conflicts=True,
+        unique_fields=['user', 'video'],
+        update_fields=['last_practiced'],
+    )
+    with _lock:
+        # only drop what was written (or can't be written); a newer touch of the same pair stays for the next flush
+        for key, touched in touches.items():
+            if _touches.get(key) == touched:
+                del _touches[key]
+    return len(progresses)
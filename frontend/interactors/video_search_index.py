@@ -0,0 +1,105 @@
+import re
+from django.db import connection
+from django.db.models import Q
+from shared.models import Video, VideoStatus
+from shared.search_keys import normalize_search_text
+from frontend.models import VideoSearchDocument
+
+# Full-text search over live videos.
+# Every live video has a VideoSearchDocument (title, channel, tag names), normalized with the
+# search key pipeline of its frontend; queries go through the same pipeline, so spelling variants
+# (alef/hamza forms, ta marbuta, diacritics, umlauts, ß) match through the index.
+# update_video_search_documents keeps them in sync and is called through cms' notify_videos_changed.
+# The index itself lives in the database (see migration frontend 0008):
+# a GIN-indexed tsvector on PostgreSQL, an FTS5 table on SQLite.
+# Every search term also matches as a prefix, and a video matches if any term does;
+# hits are ranked by relevance, newest first on ties.
+
+# More hits than anyone pages through; keeps the cost of a search independent of the catalogue size
+SEARCH_RESULT_LIMIT = 1000
+
+
+def build_video_search_document(video:Video) -> str:
+    """The normalized searchable text of a video; uses video.tags.all(), so prefetch tags when building many"""
+    parts = [video.youtube_title or video.title or '', video.channel_name or '']
+    parts.extend(tag.name for tag in video.tags.all())
+    return '\n'.join(normalize_search_text(part, video.frontend) for part in parts if part)
+
+
+def update_video_search_documents(videos) -> set[str]:
+    """(Re)build the documents of live videos and drop those of all other given videos;
+    returns the frontends whose set of live videos or their documents changed"""
+    video_ids = [video.id for video in videos]
+    # documents exist exactly for the videos that were live
+    changed_frontends = set(
+        VideoSearchDocument.objects.filter(video_id__in=video_ids).values_list('frontend', flat=True)
+    )
+    live_videos = Video.objects.filter(id__in=video_ids, status=VideoStatus.LIVE).prefetch_related('tags')
+    documents = [
+        VideoSearchDocument(video=video, frontend=video.frontend, document=build_video_search_document(video))
+        for video in live_videos
+    ]
+    VideoSearchDocument.objects.filter(video_id__in=video_ids).exclude(
+        video_id__in=[document.video_id for document in documents]
+    ).delete()
+    VideoSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['video'],
+        update_fields=['frontend', 'document'],
+    )
+    changed_frontends.update(document.frontend for document in documents)
+    return changed_frontends
+
+
+def rebuild_video_search_index(chunk_size:int=1000) -> int:
+    """Rebuild the documents of all videos, e.g. after loading fixtures; returns the number of live videos"""
+    live_count = 0
+    last_id = 0
+    while True:
+        videos = list(Video.objects.filter(id__gt=last_id).order_by('id')[:chunk_size])
+        if not videos:
+            break
+        last_id = videos[-1].id
+        update_video_search_documents(videos)
+        live_count += sum(1 for video in videos if video.status == VideoStatus.LIVE)
+    return live_count
+
+
+def search_terms(search_term:str, frontend:str) -> list[str]:
+    """The normalized words of a search; everything else (including query syntax) is dropped"""
+    return re.findall(r'\w+', normalize_search_text(search_term, frontend))
+
+
+def search_video_ids(frontend:str, search_term:str, limit:int=SEARCH_RESULT_LIMIT) -> list[int]:
+    """Ids of the live videos of the frontend matching the search, best match first"""
+    terms = search_terms(search_term, frontend)
+    if not terms:
+        return []
+    if connection.vendor == 'postgresql':
+        sql = """
+            SELECT video_id FROM frontend_videosearchdocument, to_tsquery('simple', %s) query
+            WHERE frontend = %s AND search_vector @@ query
+            ORDER BY ts_rank(search_vector, query) DESC, video_id DESC
+            LIMIT %s
+        """
+        params = [' | '.join(f'{term}:*' for term in terms), frontend, limit]
+    elif connection.vendor == 'sqlite':
+        sql = """
+            SELECT document.video_id
+            FROM frontend_videosearchdocument_fts fts
+            JOIN frontend_videosearchdocument document ON document.video_id = fts.rowid
+            WHERE frontend_videosearchdocument_fts MATCH %s AND document.frontend = %s
+            ORDER BY fts.rank, document.video_id DESC
+            LIMIT %s
+        """
+        params = [' OR '.join(f'"{term}"*' for term in terms), frontend, limit]
+    else:
+        query = Q()
+        for term in terms:
+            query |= Q(document__icontains=term)
+        documents = VideoSearchDocument.objects.filter(query, frontend=frontend).order_by('-video_id')
+        return list(documents.values_list('video_id', flat=True)[:limit])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,34 @@
+from django.core.cache import caches
+from shared.models import Frontend
+
+# Rendered share pages (frontend/videos/share.html) are the same for every visitor,
+# so they're cached as a whole, per frontend and youtube_id (both frontends share the db cache):
+# in the shared db cache until the video changes, and for a short while in each process' local cache on top.
+SHARE_PAGE_TIMEOUT = 60 * 60 * 24
+SHARE_PAGE_LOCAL_TIMEOUT = 60
+
+
+def _cache_key(frontend, youtube_id):
+    return f"video_share_page:{frontend}:{youtube_id}"
+
+
+def get_cached_video_share_page(frontend:str, youtube_id:str) -> bytes|None:
+    key = _cache_key(frontend, youtube_id)
+    content = caches['local'].get(key)
+    if content is None:
+        content = caches['default'].get(key)
+        if content is not None:
+            caches['local'].set(key, content, SHARE_PAGE_LOCAL_TIMEOUT)
+    return content
+
+
+def set_cached_video_share_page(frontend:str, youtube_id:str, content:bytes):
+    key = _cache_key(frontend, youtube_id)
+    caches['default'].set(key, content, SHARE_PAGE_TIMEOUT)
+    caches['local'].set(key, content, SHARE_PAGE_LOCAL_TIMEOUT)
+
+
+def invalidate_video_share_pages(youtube_ids):
+    keys = [_cache_key(frontend, youtube_id) for youtube_id in youtube_ids for frontend in Frontend.values]
+    caches['default'].delete_many(keys)
+    caches['local'].delete_many(keys)
@@ -0,0 +1,62 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from django.core.management.base import BaseCommand, CommandError
+from frontend.models import UserSchedulerParameters
+from frontend.interactors.iter_vocab_review_logs_by_user import iter_vocab_review_logs_by_user
+from frontend.interactors.compute_scheduler_parameters import compute_scheduler_parameters
+
+
+class Command(BaseCommand):
+    help = "Fit per-user fsrs parameters from the VocabReviewLog (needs torch and pandas: pip install -r requirements-optimizer.txt)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Number of worker processes (default: one per CPU)")
+        parser.add_argument('--min-reviews', type=int, default=400, help="Skip users with fewer reviews than this")
+        parser.add_argument('--chunk-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        try:
+            import torch, pandas  # noqa: F401
+        except ImportError:
+            raise CommandError("Fitting parameters needs the fsrs optimizer dependencies: pip install -r requirements-optimizer.txt")
+
+        fitted_count = 0
+        failed_count = 0
+        skipped_count = 0
+        max_pending = (options['workers'] or 4) * 2
+        # The workers are spawned, not forked: this process keeps querying the db while the pool starts workers,
+        # and a forked worker would inherit (and could break) its open connection. They don't need Django.
+        with ProcessPoolExecutor(max_workers=options['workers'], mp_context=multiprocessing.get_context('spawn')) as pool:
+            pending = set()
+
+            def collect(done):
+                nonlocal fitted_count, failed_count
+                for future in done:
+                    try:
+                        user_id, parameters, review_count = future.result()
+                    except Exception as e:
+                        failed_count += 1
+                        self.stderr.write(f"Error fitting parameters: {e}")
+                        continue
+                    UserSchedulerParameters.objects.update_or_create(
+                        user_id=user_id,
+                        defaults={'parameters': parameters, 'review_count': review_count},
+                    )
+                    fitted_count += 1
+                    self.stdout.write(f"User {user_id}: fitted on {review_count} reviews")
+
+            for user_id, reviews in iter_vocab_review_logs_by_user(chunk_size=options['chunk_size']):
+                if len(reviews) < options['min_reviews']:
+                    skipped_count += 1
+                    continue
+                pending.add(pool.submit(compute_scheduler_parameters, user_id, reviews))
+                # Don't hold more than a few users' logs in memory at once
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            done, _ = wait(pending)
+            collect(done)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Fitted parameters for {fitted_count} users, skipped {skipped_count} with too few reviews, {failed_count} failed."
+        ))
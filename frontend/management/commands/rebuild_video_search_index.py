@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from shared.models import Frontend
+from frontend.interactors.video_search_index import rebuild_video_search_index
+from frontend.interactors.video_list_cache import bump_catalogue_versions
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search documents of all videos and drop the cached video lists, e.g. after loading fixtures"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        live_count = rebuild_video_search_index(chunk_size=options['chunk_size'])
+        bump_catalogue_versions(Frontend.values)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {live_count} live videos"))
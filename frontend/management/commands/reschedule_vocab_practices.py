@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from fsrs import Scheduler
+from frontend.models import VocabPractice
+from frontend.interactors.reschedule_vocab_practices import reschedule_vocab_practices
+
+
+class Command(BaseCommand):
+    help = "Recompute the due date of every Review-state VocabPractice with the current fsrs Scheduler settings"
+
+    def add_arguments(self, parser):
+        default_scheduler = Scheduler()
+        parser.add_argument('--desired-retention', type=float, default=default_scheduler.desired_retention)
+        parser.add_argument('--maximum-interval', type=int, default=default_scheduler.maximum_interval)
+        parser.add_argument('--no-fuzzing', action='store_true', help="Don't add random fuzz to the intervals")
+        parser.add_argument('--user', type=int, help="Only reschedule the cards of this user id")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, help="Seed for the fuzzing, for reproducible runs")
+        parser.add_argument('--dry-run', action='store_true', help="Compute everything, but don't write")
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler(
+            desired_retention=options['desired_retention'],
+            maximum_interval=options['maximum_interval'],
+            enable_fuzzing=not options['no_fuzzing'],
+        )
+        queryset = VocabPractice.objects.all()
+        if options['user']:
+            queryset = queryset.filter(user_id=options['user'])
+
+        stats = reschedule_vocab_practices(
+            scheduler,
+            queryset=queryset,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            seed=options['seed'],
+            progress=lambda count: self.stdout.write(f"Rescheduled {count} cards..."),
+        )
+
+        if stats['rescheduled'] == 0:
+            self.stdout.write("No cards in the Review state, nothing to do.")
+            return
+        prefix = "[dry run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Rescheduled {stats['rescheduled']} cards, {stats['due_now']} of them are due now "
+            f"(mean retrievability {stats['mean_retrievability']:.3f})."
+        ))
@@ -0,0 +1,28 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from frontend.interactors.site_statistics import rollup_site_statistics
+
+
+class Command(BaseCommand):
+    help = "Roll up the site-wide statistics of finished days into DailySiteStatistics (run nightly; --days/--since to backfill)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=1, help="Roll up this many days before today (default: yesterday)")
+        parser.add_argument('--since', type=datetime.date.fromisoformat, help="Roll up every day from this date (YYYY-MM-DD) until yesterday")
+        parser.add_argument('--chunk-days', type=int, default=90, help="Days counted per query")
+
+    def handle(self, *args, **options):
+        end = timezone.localdate() - datetime.timedelta(days=1)
+        start = options['since'] or end - datetime.timedelta(days=options['days'] - 1)
+        if start > end:
+            raise CommandError("Nothing to roll up: today is not finished yet")
+
+        rolled_up = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + datetime.timedelta(days=options['chunk_days'] - 1), end)
+            rolled_up += rollup_site_statistics(chunk_start, chunk_end)
+            chunk_start = chunk_end + datetime.timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {rolled_up} days ({start} to {end})"))
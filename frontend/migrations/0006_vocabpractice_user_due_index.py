@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 08:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0005_vocabreviewlog_userschedulerparameters'),
+        ('shared', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vocabpractice',
+            index=models.Index(fields=['user', 'due'], name='frontend_vo_user_id_af78f4_idx'),
+        ),
+    ]
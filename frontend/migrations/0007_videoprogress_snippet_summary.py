@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 08:29
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_snippet_summaries(apps, schema_editor):
+    SnippetPractice = apps.get_model('frontend', 'SnippetPractice')
+    VideoProgress = apps.get_model('frontend', 'VideoProgress')
+    summaries = {}
+    for user_id, video_id, snippet_id, perceived_difficulty in SnippetPractice.objects.values_list(
+        'user_id', 'snippet__video_id', 'snippet_id', 'perceived_difficulty'
+    ).iterator():
+        summaries.setdefault((user_id, video_id), {})[str(snippet_id)] = perceived_difficulty
+    for (user_id, video_id), difficulties in summaries.items():
+        VideoProgress.objects.update_or_create(
+            user_id=user_id,
+            video_id=video_id,
+            defaults={
+                'rated_snippet_count': len(difficulties),
+                'snippet_difficulties': difficulties,
+            },
+            create_defaults={
+                'last_practiced': timezone.now(),
+                'rated_snippet_count': len(difficulties),
+                'snippet_difficulties': difficulties,
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0006_vocabpractice_user_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoprogress',
+            name='rated_snippet_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='videoprogress',
+            name='snippet_difficulties',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(backfill_snippet_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2 on 2026-10-18 08:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The full-text index depends on the database:
+# PostgreSQL gets a stored tsvector column with a GIN index, SQLite an FTS5 table kept in sync by triggers.
+# Other databases get no index; search then falls back to a scan of the document table.
+POSTGRESQL_FORWARD = [
+    """ALTER TABLE frontend_videosearchdocument
+       ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED""",
+    "CREATE INDEX frontend_videosearchdocument_search_vector ON frontend_videosearchdocument USING gin (search_vector)",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS frontend_videosearchdocument_search_vector",
+    "ALTER TABLE frontend_videosearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE frontend_videosearchdocument_fts USING fts5(
+       document, content='frontend_videosearchdocument', content_rowid='video_id', tokenize='unicode61')""",
+    """CREATE TRIGGER frontend_videosearchdocument_ai AFTER INSERT ON frontend_videosearchdocument BEGIN
+       INSERT INTO frontend_videosearchdocument_fts(rowid, document) VALUES (new.video_id, new.document);
+       END""",
+    """CREATE TRIGGER frontend_videosearchdocument_ad AFTER DELETE ON frontend_videosearchdocument BEGIN
+       INSERT INTO frontend_videosearchdocument_fts(frontend_videosearchdocument_fts, rowid, document) VALUES ('delete', old.video_id, old.document);
+       END""",
+    """CREATE TRIGGER frontend_videosearchdocument_au AFTER UPDATE ON frontend_videosearchdocument BEGIN
+       INSERT INTO frontend_videosearchdocument_fts(frontend_videosearchdocument_fts, rowid, document) VALUES ('delete', old.video_id, old.document);
+       INSERT INTO frontend_videosearchdocument_fts(rowid, document) VALUES (new.video_id, new.document);
+       END""",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS frontend_videosearchdocument_ai",
+    "DROP TRIGGER IF EXISTS frontend_videosearchdocument_ad",
+    "DROP TRIGGER IF EXISTS frontend_videosearchdocument_au",
+    "DROP TABLE IF EXISTS frontend_videosearchdocument_fts",
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRESQL_FORWARD, 'sqlite': SQLITE_FORWARD})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRESQL_BACKWARD, 'sqlite': SQLITE_BACKWARD})
+
+
+def backfill_search_documents(apps, schema_editor):
+    Video = apps.get_model('shared', 'Video')
+    VideoSearchDocument = apps.get_model('frontend', 'VideoSearchDocument')
+    documents = []
+    for video in Video.objects.filter(status='live').prefetch_related('tags').iterator(chunk_size=1000):
+        parts = [video.youtube_title or video.title or '', video.channel_name or '']
+        parts.extend(tag.name for tag in video.tags.all())
+        documents.append(VideoSearchDocument(
+            video_id=video.id,
+            frontend=video.frontend,
+            document='\n'.join(part for part in parts if part),
+        ))
+    VideoSearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0007_videoprogress_snippet_summary'),
+        ('shared', '0002_video_snippet_timeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoSearchDocument',
+            fields=[
+                ('video', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='shared.video')),
+                ('frontend', models.CharField(max_length=10)),
+                ('document', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
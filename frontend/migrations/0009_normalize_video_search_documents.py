@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 08:37
+
+from django.db import migrations
+from shared.search_keys import normalize_search_text
+
+
+def normalize_documents(apps, schema_editor):
+    VideoSearchDocument = apps.get_model('frontend', 'VideoSearchDocument')
+    documents = list(VideoSearchDocument.objects.all())
+    for document in documents:
+        # the search key steps are idempotent, so normalizing the whole stored document is enough
+        document.document = '\n'.join(
+            normalize_search_text(line, document.frontend) for line in document.document.split('\n')
+        )
+    VideoSearchDocument.objects.bulk_update(documents, ['document'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0008_videosearchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 08:38
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_terms(apps, schema_editor):
+    # get_or_create without a unique constraint could race into duplicate rows; keep the first, summing the counts
+    SearchQuery = apps.get_model('frontend', 'SearchQuery')
+    duplicates = SearchQuery.objects.values('term').annotate(rows=Count('id'), total=Sum('count')).filter(rows__gt=1)
+    for duplicate in duplicates:
+        queries = SearchQuery.objects.filter(term=duplicate['term']).order_by('id')
+        first = queries.first()
+        queries.exclude(id=first.id).delete()
+        first.count = duplicate['total']
+        first.save(update_fields=['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0009_normalize_video_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_terms, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='searchquery',
+            name='term',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-18 08:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_activity(apps, schema_editor):
+    # before the review log, words and snippet ratings only have their last update date (what the dashboard counted);
+    # days that do have review log rows take the exact number of reviews from it
+    VocabPractice = apps.get_model('frontend', 'VocabPractice')
+    VocabReviewLog = apps.get_model('frontend', 'VocabReviewLog')
+    SnippetPractice = apps.get_model('frontend', 'SnippetPractice')
+    DailyActivity = apps.get_model('frontend', 'DailyActivity')
+    activities = {}
+    for model, date_field, count_field in [
+        (VocabPractice, 'updated', 'words_reviewed'),
+        (VocabReviewLog, 'reviewed_at', 'words_reviewed'),
+        (SnippetPractice, 'updated', 'snippets_rated'),
+    ]:
+        for row in model.objects.annotate(day=TruncDate(date_field)).values('user_id', 'day').annotate(count=Count('id')):
+            activity = activities.setdefault((row['user_id'], row['day']), DailyActivity(user_id=row['user_id'], day=row['day']))
+            setattr(activity, count_field, row['count'])
+    DailyActivity.objects.bulk_create(activities.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0010_searchquery_unique_term'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('words_reviewed', models.IntegerField(default=0)),
+                ('snippets_rated', models.IntegerField(default=0)),
+                ('seconds_spent', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_activity, migrations.RunPython.noop),
+    ]
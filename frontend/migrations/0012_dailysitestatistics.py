@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-18 08:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+# auth.User is not ours to add Meta indexes to; the site statistics count logins and
+# registrations per day over ranges of these columns, so index them here
+USER_INDEXES = [
+    ('frontend_auth_user_last_login_idx', 'last_login'),
+    ('frontend_auth_user_date_joined_idx', 'date_joined'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0011_dailyactivity'),
+        ('shared', '0004_video_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySiteStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('logins', models.IntegerField(default=0)),
+                ('registrations', models.IntegerField(default=0)),
+                ('videos_practiced', models.IntegerField(default=0)),
+                ('words_practiced', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailyactivity',
+            index=models.Index(fields=['day'], name='frontend_da_day_0537e5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videoprogress',
+            index=models.Index(fields=['last_practiced'], name='frontend_vi_last_pr_ba930a_idx'),
+        ),
+        migrations.RunSQL(
+            [f'CREATE INDEX IF NOT EXISTS {name} ON auth_user ({column})' for name, column in USER_INDEXES],
+            [f'DROP INDEX IF EXISTS {name}' for name, _ in USER_INDEXES],
+        ),
+    ]
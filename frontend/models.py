@@ -11,9 +11,17 @@ class VideoProgress(models.Model):
     # Update last_practiced whenever the video is viewed.
     last_practiced = models.DateTimeField(default=timezone.now)
     perceived_difficulty = models.IntegerField(null=True, blank=True)
+    # Summary of the user's SnippetPractices of this video, kept up to date by SaveSnippetRatingView
+    # so the video page doesn't have to query them: {snippet_id: perceived_difficulty}
+    rated_snippet_count = models.IntegerField(default=0)
+    snippet_difficulties = models.JSONField(default=dict, blank=True)
 
     class Meta:
         unique_together = ('user', 'video')
+        # site statistics count the practices per day over ranges of last_practiced
+        indexes = [
+            models.Index(fields=['last_practiced']),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.video} last practiced on {self.last_practiced}"
@@ -36,6 +44,10 @@ class VocabPractice(models.Model):
     
     class Meta:
         unique_together = ('user', 'word')
+        indexes = [
+            # due review queue: a user's due words, ordered by due
+            models.Index(fields=['user', 'due']),
+        ]
     
     def __str__(self):
         return f"{self.user} - {self.word} practice"
@@ -45,6 +57,73 @@ class VocabPractice(models.Model):
         return self.due and self.due <= timezone.now()
 
 
+class VocabReviewLog(models.Model):
+    """Append-only: one row per rating, written in bulk together with the VocabPractice update.
+    Used offline to fit fsrs parameters, never read on the request path."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="vocab_review_logs", db_index=False)
+    # Words get deleted and recreated whenever translations are regenerated;
+    # the history should survive that, so no constraint (and no index, nothing looks logs up by word)
+    word = models.ForeignKey(Word, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="+")
+    rating = models.PositiveSmallIntegerField()
+    reviewed_at = models.DateTimeField()
+    # Days since the previous review of this word, None for the first review
+    elapsed_days = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        # The offline optimizer streams the log per user in id order
+        indexes = [
+            models.Index(fields=['user', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.word_id} rated {self.rating} on {self.reviewed_at}"
+
+
+class UserSchedulerParameters(models.Model):
+    """fsrs parameters fitted to a user's review log by the fit_scheduler_parameters command"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="scheduler_parameters")
+    parameters = models.JSONField()
+    review_count = models.IntegerField(default=0)
+    fitted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} - fitted on {self.review_count} reviews"
+
+
+class DailyActivity(models.Model):
+    """Per user and day: what they practiced, incremented in the same transaction as the practice itself.
+    The dashboard charts read ranges of these rows."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_activities")
+    day = models.DateField()
+    words_reviewed = models.IntegerField(default=0)
+    snippets_rated = models.IntegerField(default=0)
+    seconds_spent = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'day')
+        # site statistics sum all users' rows over a range of days
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.day}: {self.words_reviewed} words, {self.snippets_rated} snippets"
+
+
+class DailySiteStatistics(models.Model):
+    """Site-wide counts of one finished day, written by the rollup_site_statistics command (nightly and for backfills).
+    The CMS statistics page reads past days from here and only counts today live."""
+    day = models.DateField(unique=True)
+    logins = models.IntegerField(default=0)
+    registrations = models.IntegerField(default=0)
+    videos_practiced = models.IntegerField(default=0)
+    words_practiced = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.day}: {self.logins} logins, {self.registrations} registrations"
+
+
 class SnippetPractice(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="snippet_practices")
     snippet = models.ForeignKey(Snippet, on_delete=models.CASCADE, related_name="snippet_practices")
@@ -71,12 +150,24 @@ class Feedback(models.Model):
     
 
 class SearchQuery(models.Model):
-    term = models.CharField(max_length=255)
+    """How often each search term was searched; counted by frontend.interactors.search_query_counter"""
+    term = models.CharField(max_length=255, unique=True)
     count = models.IntegerField(default=0)
 
     def __str__(self):
         return f"{self.term} - {self.count}"
 
+
+class VideoSearchDocument(models.Model):
+    """The searchable text (title, channel, tag names) of a live video, kept up to date by update_video_search_documents.
+    Migration 0008 indexes `document` with a tsvector/GIN index on PostgreSQL and an FTS5 table on SQLite."""
+    video = models.OneToOneField(Video, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    frontend = models.CharField(max_length=10)
+    document = models.TextField()
+
+    def __str__(self):
+        return f"{self.video_id} - {self.document[:60]}"
+
 class ContentWish(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="content_wishes")
     wish = models.TextField()
@@ -3,19 +3,6 @@ from django.template.defaultfilters import stringfilter
 
 register = template.Library()
 
-@register.filter
-def get_left_position(index, snippets):
-    if index == 0:
-        return 0
-    total_duration = snippets.last().end_time
-    previous_snippet = snippets[index - 1]
-    return (previous_snippet.end_time / total_duration) * 100
-
-@register.filter
-def get_width(snippet, snippets):
-    total_duration = snippets.last().end_time
-    return ((snippet.end_time - snippet.start_time) / total_duration) * 100
-
 @register.filter
 def get_difficulty_color(snippet, index):
     difficulty = snippet.perceived_difficulty
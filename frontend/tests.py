@@ -0,0 +1,199 @@
+import importlib
+from unittest import mock
+import numpy as np
+from fsrs import Card, Rating, Scheduler, State
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from shared.models import Video, Word
+from frontend.models import DailyActivity, DailySiteStatistics, VideoProgress, VocabPractice, VocabReviewLog
+from frontend.interactors.get_due_review_queue import get_due_review_queue
+from frontend.interactors.reschedule_vocab_practices import next_intervals, retrievabilities
+from frontend.interactors.keyset_cursor import encode_cursor, decode_cursor
+from frontend.interactors.keyset_page import _cursor_kind, get_keyset_page
+from frontend.interactors.get_videos_for_search import RankedVideos, _get_ranked_page
+from frontend.interactors.site_statistics import SITE_STATISTICS_FIELDS, rollup_site_statistics
+from frontend.interactors import video_progress_touches
+
+
+class KeysetPageTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for index in range(5):
+            video = Video.objects.create(youtube_id=f'video{index}')
+            # added_at is set on create
+            Video.objects.filter(id=video.id).update(added_at=now - timezone.timedelta(minutes=index))
+
+    def test_pages_through_all_rows(self):
+        first, next_cursor, previous_cursor = get_keyset_page(Video.objects.all(), ['-added_at', 'id'], None, 3)
+        second, last_cursor, back_cursor = get_keyset_page(Video.objects.all(), ['-added_at', 'id'], next_cursor, 3)
+        self.assertIsNone(previous_cursor)
+        self.assertIsNone(last_cursor)
+        self.assertEqual([video.youtube_id for video in first + second], [f'video{index}' for index in range(5)])
+        self.assertEqual(get_keyset_page(Video.objects.all(), ['-added_at', 'id'], back_cursor, 3)[0], first)
+
+    def test_bad_cursors_start_from_the_first_page(self):
+        first = get_keyset_page(Video.objects.all(), ['-added_at', 'id'], None, 3)[0]
+        kind = _cursor_kind(Video.objects.all(), ['-added_at', 'id'])
+        for values in [['next', 'abc', 5], ['prev', '2024-01-01', 'x'], ['next', None, 1], ['next', 1], ['sideways', '2024-01-01', 1]]:
+            self.assertEqual(get_keyset_page(Video.objects.all(), ['-added_at', 'id'], encode_cursor(kind, values), 3)[0], first)
+
+    def test_cursors_of_other_listings_start_from_the_first_page(self):
+        first = get_keyset_page(Video.objects.all(), ['-added_at', 'id'], None, 3)[0]
+        cms_cursor = get_keyset_page(Video.objects.all(), ['status', 'youtube_id'], None, 2)[1]
+        ranked_cursor = _get_ranked_page(RankedVideos(list(Video.objects.values_list('id', flat=True))), None, 2)[1]
+        for cursor in [cms_cursor, ranked_cursor, encode_cursor('due_review_queue', [timezone.now(), 1])]:
+            self.assertEqual(get_keyset_page(Video.objects.all(), ['-added_at', 'id'], cursor, 3)[0], first)
+        ranked_videos = RankedVideos(list(Video.objects.order_by('id').values_list('id', flat=True)))
+        self.assertEqual(_get_ranked_page(ranked_videos, cms_cursor, 2)[0], _get_ranked_page(ranked_videos, None, 2)[0])
+
+    def test_forged_cursors_are_ignored(self):
+        cursor = encode_cursor('test', ['next', 'video1'])
+        self.assertEqual(decode_cursor(cursor, 'test', 2), ['next', 'video1'])
+        self.assertIsNone(decode_cursor(cursor, 'other', 2))
+        self.assertIsNone(decode_cursor(cursor, 'test', 3))
+        self.assertIsNone(decode_cursor(cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B'), 'test', 2))
+        self.assertIsNone(decode_cursor('not a cursor', 'test', 2))
+
+
+class DueReviewQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='learner')
+        now = timezone.now()
+        for index in range(3):
+            word = Word.objects.create(original_word=f'wort{index}')
+            VocabPractice.objects.create(user=self.user, word=word, due=now - timezone.timedelta(days=3 - index))
+
+    def test_pages_in_due_order(self):
+        first, cursor = get_due_review_queue(self.user, 'de', limit=2)
+        rest, last_cursor = get_due_review_queue(self.user, 'de', cursor, limit=2)
+        self.assertEqual([word['original_word'] for word in first + rest], ['wort0', 'wort1', 'wort2'])
+        self.assertIsNone(last_cursor)
+
+    def test_bad_cursors_start_from_the_first_page(self):
+        first = get_due_review_queue(self.user, 'de', limit=2)[0]
+        for values in [['2024-01-01T00:00:00+00:00'], ['abc', 1], ['2024-01-01T00:00:00+00:00', 'x'], [None, 1], [1, 2, 3]]:
+            self.assertEqual(get_due_review_queue(self.user, 'de', encode_cursor('due_review_queue', values), limit=2)[0], first)
+
+
+class RescheduleVocabPracticesTests(SimpleTestCase):
+    """The vectorized interval math against the fsrs Scheduler it mirrors, through the public API only"""
+
+    def test_next_intervals_match_the_scheduler(self):
+        last_review = timezone.now() - timezone.timedelta(days=30)
+        for desired_retention, maximum_interval in [(0.9, 36500), (0.8, 36500), (0.95, 100)]:
+            scheduler = Scheduler(desired_retention=desired_retention, maximum_interval=maximum_interval, enable_fuzzing=False)
+            stabilities = []
+            expected = []
+            for stability in [0.1, 0.5, 1.0, 2.4, 3.0, 7.5, 20.0, 100.0, 365.0, 5000.0]:
+                card = Card(card_id=1, state=State.Review, stability=stability, difficulty=5.0, due=last_review, last_review=last_review)
+                card, _ = scheduler.review_card(card, Rating.Good, review_datetime=last_review)
+                stabilities.append(card.stability)
+                expected.append((card.due - last_review).days)
+            self.assertEqual(next_intervals(np.array(stabilities), scheduler).tolist(), expected)
+
+    def test_retrievabilities_match_the_card(self):
+        now = timezone.now()
+        stabilities = [0.5, 3.0, 20.0, 365.0]
+        elapsed_days = [0, 1, 10, 400]
+        expected = [
+            Card(card_id=1, state=State.Review, stability=stability, last_review=now - timezone.timedelta(days=days)).get_retrievability(now)
+            for stability, days in zip(stabilities, elapsed_days)
+        ]
+        np.testing.assert_allclose(retrievabilities(np.array(stabilities), np.array(elapsed_days)), expected)
+
+
+class DailyActivityBackfillTests(TestCase):
+    def test_words_reviewed_before_the_review_log_come_from_the_practices(self):
+        backfill_daily_activity = importlib.import_module('frontend.migrations.0011_dailyactivity').backfill_daily_activity
+        user = User.objects.create(username='learner')
+        today = timezone.now()
+        long_ago = today - timezone.timedelta(days=30)
+        words = [Word.objects.create(original_word=f'wort{index}') for index in range(3)]
+        for word in words:
+            VocabPractice.objects.create(user=user, word=word)
+        # updated is set on save
+        VocabPractice.objects.filter(word__in=words[:2]).update(updated=long_ago)
+        VocabPractice.objects.filter(word=words[2]).update(updated=today)
+        # today the log has every review (the same word twice)
+        for _ in range(2):
+            VocabReviewLog.objects.create(user=user, word=words[2], rating=3, reviewed_at=today)
+
+        backfill_daily_activity(apps, None)
+        self.assertEqual(
+            dict(DailyActivity.objects.filter(user=user).values_list('day', 'words_reviewed')),
+            {timezone.localdate(long_ago): 2, timezone.localdate(today): 2},
+        )
+
+
+class SiteStatisticsTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        now = timezone.now()
+        video = Video.objects.create(youtube_id='video')
+        for index in range(6):
+            days_ago = timezone.timedelta(days=index % 4 + 1)
+            user = User.objects.create(username=f'learner{index}', last_login=now - days_ago, date_joined=now - days_ago * 2)
+            VideoProgress.objects.create(user=user, video=video, last_practiced=now - days_ago)
+            for word_index in range(index):
+                word, _ = Word.objects.get_or_create(original_word=f'wort{word_index}')
+                VocabPractice.objects.create(user=user, word=word, last_review=now - timezone.timedelta(days=word_index % 5 + 1))
+
+    def old_statistics(self, day):
+        """The per-day queries of the statistics page before the rollup"""
+        return {
+            'logins': User.objects.filter(last_login__date=day).count(),
+            'registrations': User.objects.filter(date_joined__date=day).count(),
+            'videos_practiced': VideoProgress.objects.filter(last_practiced__date=day).count(),
+            'words_practiced': VocabPractice.objects.filter(last_review__date=day).count(),
+        }
+
+    def test_a_rollup_of_days_before_daily_activity_matches_the_old_statistics(self):
+        start = self.today - timezone.timedelta(days=10)
+        end = self.today - timezone.timedelta(days=1)
+        self.assertEqual(rollup_site_statistics(start, end), 10)
+        rolled_up = {row['day']: row for row in DailySiteStatistics.objects.values('day', *SITE_STATISTICS_FIELDS)}
+        for offset in range(10):
+            day = start + timezone.timedelta(days=offset)
+            with self.subTest(day=day):
+                self.assertEqual({field: rolled_up[day][field] for field in SITE_STATISTICS_FIELDS}, self.old_statistics(day))
+        self.assertGreater(sum(row['words_practiced'] for row in rolled_up.values()), 0)
+
+    def test_days_with_daily_activity_sum_it(self):
+        day = self.today - timezone.timedelta(days=1)
+        user = User.objects.get(username='learner0')
+        DailyActivity.objects.create(user=user, day=day, words_reviewed=40)
+        rollup_site_statistics(day, day)
+        self.assertEqual(DailySiteStatistics.objects.get(day=day).words_practiced, 40)
+
+
+@override_settings(LANGUAGE_TO_LEARN='de')
+class VideoProgressEndpointTests(TestCase):
+    def setUp(self):
+        # no background flushing: the test flushes by hand
+        periodic_flush = mock.patch('frontend.interactors.video_progress_touches.ensure_periodic_flush')
+        periodic_flush.start()
+        self.addCleanup(periodic_flush.stop)
+        self.addCleanup(video_progress_touches._touches.clear)
+        self.user = User.objects.create(username='learner')
+        self.video = Video.objects.create(youtube_id='video', frontend='de')
+        self.client.force_login(self.user)
+
+    def get_last_practiced(self):
+        response = self.client.get(f'/videos/{self.video.youtube_id}/progress/', secure=True)
+        return response.json()['last_practiced']
+
+    def test_returns_the_unflushed_touch_of_the_previous_view(self):
+        self.assertIsNone(self.get_last_practiced())
+        touched = video_progress_touches.get_buffered_video_touches(self.user)[self.video.id]
+        # not written yet, but the next view sees it
+        self.assertFalse(VideoProgress.objects.exists())
+        self.assertEqual(self.get_last_practiced(), touched.isoformat())
+
+    def test_returns_the_stored_touch_after_the_flush(self):
+        self.get_last_practiced()
+        video_progress_touches.flush_video_progress_touches()
+        stored = VideoProgress.objects.get(user=self.user, video=self.video).last_practiced
+        self.assertEqual(video_progress_touches.get_buffered_video_touches(self.user), {})
+        self.assertEqual(self.get_last_practiced(), stored.isoformat())
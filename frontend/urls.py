@@ -4,12 +4,14 @@ from frontend.views.snippets.save_snippet_rating import SaveSnippetRatingView
 from frontend.views.videos.list import video_list
 from frontend.views.videos.detail import video_detail
 from frontend.views.videos.share_view import video_share
+from frontend.views.videos.progress import video_progress
 from frontend.views.snippets.practice_and_watch import SnippetDetailView, SnippetWatchView, SnippetAllWordsView
 from frontend.views.snippets.redirect_to_next_snippet import redirect_to_next_snippet
 from frontend.views.dashboard import dashboard
 from frontend.views.onboarding import onboarding
 from frontend.views.landing import landing
 from frontend.views.suggest_content import SuggestContentView
+from frontend.views.review.due_queue import due_review_queue
 
 app_name = 'frontend'
 
@@ -20,6 +22,7 @@ urlpatterns = [
     path('videos/', video_list, name='video_list'),
     path('videos/<slug:youtube_id>/', video_detail, name='video_detail'),
     path('videos/<slug:youtube_id>/share/', video_share, name='video_share'),
+    path('videos/<slug:youtube_id>/progress/', video_progress, name='video_progress'),
     path('snippets/<int:pk>/practice/', SnippetDetailView.as_view(), name='snippet_practice'),
     path('snippets/<int:pk>/practice-all/', SnippetAllWordsView.as_view(), name='snippet_practice_all'),
     path('snippets/<int:pk>/watch/', SnippetWatchView.as_view(), name='snippet_watch'),
@@ -27,4 +30,5 @@ urlpatterns = [
     path('save_snippet_rating/', SaveSnippetRatingView.as_view(), name='save_snippet_rating'),
     path('redirect_to_next_snippet/<int:pk>/', redirect_to_next_snippet, name='redirect_to_next_snippet'),
     path('suggest-content/', SuggestContentView.as_view(), name='suggest_content'),
+    path('review/due/', due_review_queue, name='due_review_queue'),
 ] 
\ No newline at end of file
@@ -1,78 +1,39 @@
 from django.shortcuts import render, redirect
 from django.utils import timezone
 from datetime import timedelta
-from frontend.models import VideoProgress, VocabPractice, SnippetPractice
-from django.db.models import Count
+from frontend.models import VideoProgress
 import json
 from guest_user.decorators import allow_guest_user
 from guest_user.functions import is_guest_user
+from frontend.interactors.get_recently_practiced_videos import get_recently_practiced_videos
+from frontend.interactors.video_progress_touches import get_buffered_video_touches
+from frontend.interactors.get_daily_activity import get_daily_activity
 
 @allow_guest_user
 def dashboard(request):
     # If user is new (no VideoProgress), redirect to landing
-    if not VideoProgress.objects.filter(user=request.user).exists():
+    # (video views are written behind, so also check the not yet flushed ones)
+    if not get_buffered_video_touches(request.user) and not VideoProgress.objects.filter(user=request.user).exists():
         return redirect('frontend:landing')
 
-    # Get 3 most recently practiced videos
-    recent_videos = VideoProgress.objects.filter(
-        user=request.user
-    ).select_related('video').order_by('-last_practiced')[:3]
+    # Get 3 most recently practiced videos, with last_practiced attached
+    recent_videos = get_recently_practiced_videos(request.user, 3)
 
-    # Attach last_practiced directly to each video object
-    for vp in recent_videos:
-        vp.video.last_practiced = vp.last_practiced
-
-    # Get practice data for last 10 days
-    end_date = timezone.now()
+    # Practice data for the last 10 days (and today), from the daily activity rollup
+    end_date = timezone.localdate()
     start_date = end_date - timedelta(days=10)
-    
-    # Vocabulary practice data
-    vocab_data = VocabPractice.objects.filter(
-        user=request.user,
-        updated__range=(start_date, end_date)
-    ).extra(
-        select={'date': 'DATE(updated)'}
-    ).values('date').annotate(
-        count=Count('id')
-    ).order_by('date')
-    
-    # Snippet practice data
-    snippet_data = SnippetPractice.objects.filter(
-        user=request.user,
-        updated__range=(start_date, end_date)
-    ).extra(
-        select={'date': 'DATE(updated)'}
-    ).values('date').annotate(
-        count=Count('id', distinct=True)
-    ).order_by('date')
-    
+    activity = get_daily_activity(request.user, start_date, end_date)
+
     # Prepare data for charts
-    vocab_dates = []
-    vocab_counts = []
-    snippet_dates = []
-    snippet_counts = []
-    
-    # Fill in all dates in the range
-    current_date = start_date
-    while current_date <= end_date:
-        date_str = current_date.strftime('%Y-%m-%d')
-        vocab_dates.append(date_str)
-        snippet_dates.append(date_str)
-        
-        # Find matching data points - date is already a string in YYYY-MM-DD format
-        vocab_count = next((item['count'] for item in vocab_data if item['date'] == date_str), 0)
-        snippet_count = next((item['count'] for item in snippet_data if item['date'] == date_str), 0)
-        
-        vocab_counts.append(vocab_count)
-        snippet_counts.append(snippet_count)
-        
-        current_date += timedelta(days=1)
+    dates = [day['day'].strftime('%Y-%m-%d') for day in activity]
+    vocab_counts = [day['words_reviewed'] for day in activity]
+    snippet_counts = [day['snippets_rated'] for day in activity]
     
     context = {
-        'recent_videos': [vp.video for vp in recent_videos],
-        'vocab_dates': json.dumps(vocab_dates),
+        'recent_videos': recent_videos,
+        'vocab_dates': json.dumps(dates),
         'vocab_counts': json.dumps(vocab_counts),
-        'snippet_dates': json.dumps(snippet_dates),
+        'snippet_dates': json.dumps(dates),
         'snippet_counts': json.dumps(snippet_counts),
         'is_guest': is_guest_user(request.user),
     }
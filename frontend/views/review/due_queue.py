@@ -0,0 +1,27 @@
+from django.http import JsonResponse
+from django.conf import settings
+from guest_user.decorators import allow_guest_user
+from frontend.interactors.get_due_review_queue import get_due_review_queue
+
+@allow_guest_user
+def due_review_queue(request):
+    """JSON queue of the user's due words across all videos, paged with ?cursor="""
+    # Use the feature flag to select the frontend language
+    language_code = getattr(settings, 'LANGUAGE_TO_LEARN', 'de')
+    frontend_value = language_code  # 'de' or 'ar'
+
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 200)
+    except ValueError:
+        limit = 50
+
+    words, next_cursor = get_due_review_queue(
+        request.user,
+        frontend_value,
+        cursor=request.GET.get('cursor'),
+        limit=limit,
+    )
+    return JsonResponse({
+        'words': words,
+        'next_cursor': next_cursor,
+    })
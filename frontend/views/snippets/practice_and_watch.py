@@ -1,54 +1,36 @@
 from django.views.generic import DetailView
+from django.utils.decorators import method_decorator
+from guest_user.decorators import allow_guest_user
 from shared.models import Snippet
 import json
 from random import shuffle
-import re
 from frontend.interactors.enrich_snippet_vocab_with_user_progress import enrich_snippet_vocab_with_user_progress
+from frontend.interactors.get_snippet_words_with_user_progress import get_snippet_words_with_user_progress
 
+# Guest users are created here too, since visitors may arrive straight from the (cached) share page
+@method_decorator(allow_guest_user, name='dispatch')
 class SnippetDetailView(DetailView):
     model = Snippet
+    queryset = Snippet.objects.select_related('video')
     template_name = 'frontend/snippets/practice.html'
     context_object_name = 'snippet'
 
-    def _deduplicate_meanings(self, meanings):
-        """Deduplicate meanings based on various criteria:
-        - Remove exact duplicates
-        - Remove case-insensitive duplicates
-        - Remove duplicates that only differ by parenthetical content
-        """
-        seen = set()
-        unique_meanings = []
-        
-        for meaning in meanings:
-            # Remove content in parentheses for comparison
-            base_meaning = re.sub(r'\([^)]*\)', '', meaning).strip()
-            # Convert to lowercase for case-insensitive comparison
-            normalized = base_meaning.lower()
-            
-            if normalized not in seen:
-                seen.add(normalized)
-                unique_meanings.append(meaning)
-        
-        return unique_meanings
+    def get_words(self):
+        """Words to practice: only the ones that are new or due for the current user"""
+        return enrich_snippet_vocab_with_user_progress(self.object, self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        user = self.request.user
-        enriched_words = enrich_snippet_vocab_with_user_progress(self.object, user)
-
         # Prepare words data for Alpine.js
         words_data = []
-        for word in enriched_words:
-            # Get all meanings and deduplicate them
-            meanings = [meaning.en for meaning in word.meanings.all()]
-            unique_meanings = self._deduplicate_meanings(meanings)
-            
+        # Meanings come already deduplicated from the cached snippet payload
+        for word in self.get_words():
             words_data.append({
-                'id': word.id,
-                'original_word': word.original_word,
-                'is_new': word.is_new,
-                'meanings': unique_meanings
+                'id': word['id'],
+                'original_word': word['original_word'],
+                'is_new': word['is_new'],
+                'meanings': word['meanings']
             })
         
         # Randomize the order
@@ -68,43 +50,11 @@ class SnippetDetailView(DetailView):
 class SnippetAllWordsView(SnippetDetailView):
     """View for practicing all words in a snippet, regardless of whether they're due."""
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        
-        # Get all words for this snippet
-        words = self.object.words.all()
-        
-        # Prepare words data for Alpine.js
-        words_data = []
-        for word in words:
-            # Get all meanings and deduplicate them
-            meanings = [meaning.en for meaning in word.meanings.all()]
-            unique_meanings = self._deduplicate_meanings(meanings)
-            
-            # Check if user has practiced this word before
-            has_progress = word.vocab_practices.filter(user=self.request.user).exists()
-            
-            words_data.append({
-                'id': word.id,
-                'original_word': word.original_word,
-                'is_new': not has_progress,  # Mark as new if user hasn't practiced it before
-                'meanings': unique_meanings
-            })
-        
-        # Randomize the order
-        shuffle(words_data)
-        
-        # Add to context as JSON
-        context['words_json'] = json.dumps(words_data)
-        context['snippet_data'] = json.dumps({
-            'youtube_id': self.object.video.youtube_id,
-            'start_time': self.object.start_time,
-            'end_time': self.object.end_time,
-            'snippet_id': self.object.id
-        })
-        
-        return context
+    def get_words(self):
+        # is_new is still set per word, so words the user never practiced show their meanings right away
+        return get_snippet_words_with_user_progress(self.object, self.request.user)
 
+@method_decorator(allow_guest_user, name='dispatch')
 class SnippetWatchView(DetailView):
     model = Snippet
     template_name = 'frontend/snippets/watch.html'
@@ -2,11 +2,10 @@ from django.views import View
 from django.http import HttpResponseRedirect
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
-from frontend.models import VocabPractice
-from shared.models import Word, Snippet
+from shared.models import Snippet
 import json
-from fsrs import Scheduler, Card, State, Rating
-from datetime import datetime, timezone
+from fsrs import Rating
+from frontend.interactors.review_vocab_practices import review_vocab_practices
 
 class SavePracticedWordsView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
@@ -17,26 +16,13 @@ class SavePracticedWordsView(LoginRequiredMixin, View):
             return HttpResponseRedirect('/')
         ratings = json.loads(ratings_json)
         snippet = Snippet.objects.get(id=snippet_id)
-        scheduler = Scheduler()
+        # Collect the session's ratings first, then review them as one batch
+        ratings_by_word_id = {}
         for entry in ratings:
             word_id = entry.get('word_id')
             rating = entry.get('rating')
             if not word_id or not rating:
                 continue
-            try:
-                practice = VocabPractice.objects.get(user=request.user, word_id=word_id)
-                # Recreate Card from DB
-                card = Card(
-                    state=State[practice.state] if practice.state else State.Learning,
-                    step=getattr(practice, 'step', None),
-                    stability=practice.stability,
-                    difficulty=practice.difficulty,
-                    due=practice.due,
-                    last_review=practice.last_review,
-                )
-            except VocabPractice.DoesNotExist:
-                card = Card()
-                practice = VocabPractice(user=request.user, word_id=word_id)
             # Map int rating to Rating enum
             if int(rating) == 1:
                 fsrs_rating = Rating.Again
@@ -48,16 +34,12 @@ class SavePracticedWordsView(LoginRequiredMixin, View):
                 fsrs_rating = Rating.Easy
             else:
                 continue
-            # Review the card
-            card, _ = scheduler.review_card(card, fsrs_rating)
-            # Save all fields back
-            practice.state = card.state.name if card.state else "Learning"
-            practice.step = card.step
-            practice.stability = card.stability
-            practice.difficulty = card.difficulty
-            practice.due = card.due
-            practice.last_review = card.last_review
-            practice.save()
+            ratings_by_word_id[int(word_id)] = fsrs_rating
+        try:
+            seconds_spent = int(request.POST.get('seconds_spent', 0))
+        except ValueError:
+            seconds_spent = 0
+        review_vocab_practices(request.user, ratings_by_word_id, seconds_spent)
         if action == 'practice_again':
             return HttpResponseRedirect(reverse('frontend:snippet_practice_all', kwargs={'pk': snippet.id}))
         elif action == 'watch_snippet':
@@ -4,8 +4,7 @@ from django.shortcuts import render
 from django.urls import reverse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from shared.models import Snippet
-from frontend.models import SnippetPractice
-from datetime import datetime, timezone
+from frontend.interactors.save_snippet_rating import save_snippet_rating
 
 class SaveSnippetRatingView(LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
@@ -14,14 +13,8 @@ class SaveSnippetRatingView(LoginRequiredMixin, View):
         if not snippet_id or rating is None:
             return HttpResponseRedirect('/')
         snippet = Snippet.objects.get(id=snippet_id)
-        # Save or update the SnippetPractice
-        practice, _ = SnippetPractice.objects.get_or_create(
-            user=request.user,
-            snippet=snippet
-        )
-        practice.perceived_difficulty = int(rating)
-        practice.updated = datetime.now(timezone.utc)
-        practice.save()
+        # Save or update the SnippetPractice (and the video's progress summary)
+        save_snippet_rating(request.user, snippet, int(rating))
         # Prepare context for re-render
         next_snippet = snippet.video.snippets.filter(index__gt=snippet.index).first()
         next_snippet_url = reverse('frontend:snippet_watch', kwargs={'pk': next_snippet.id}) if next_snippet else None
@@ -2,9 +2,10 @@ from django.shortcuts import render, get_object_or_404
 from shared.models import Video
 from guest_user.decorators import allow_guest_user
 from frontend.models import VideoProgress
-from django.utils import timezone
+from frontend.interactors.video_progress_touches import touch_video_progress
 from frontend.interactors.enrich_video_snippets_with_user_progress import enrich_video_snippets_with_user_progress
 from frontend.interactors.calculate_video_progress import calculate_video_progress
+from frontend.interactors.snippet_timeline import attach_snippet_timeline
 from django.conf import settings
 
 @allow_guest_user
@@ -14,24 +15,22 @@ def video_detail(request, youtube_id):
     frontend_value = language_code  # 'de' or 'ar'
 
     video = get_object_or_404(Video, youtube_id=youtube_id, frontend=frontend_value)
-    enriched_snippets = enrich_video_snippets_with_user_progress(video, request.user)
-    snippets = video.snippets.all().order_by('index')
-    total = snippets.count()
-    # Upsert VideoProgress for this user and video
+    # VideoProgress holds the user's snippet progress summary; last_practiced is written behind
+    video_progress = None
     if request.user.is_authenticated:
-        VideoProgress.objects.update_or_create(
-            user=request.user,
-            video=video,
-            defaults={"last_practiced": timezone.now()}
-        )
-    # Placeholder: no perceivedDifficulty, so progress is always 0
-    progress = calculate_video_progress(video, request.user)
-    first_snippet = snippets.first() if snippets else None
+        video_progress = VideoProgress.objects.filter(user=request.user, video=video).first()
+        touch_video_progress(request.user, video)
+    enriched_snippets = enrich_video_snippets_with_user_progress(video, video_progress)
+    total = len(enriched_snippets)
+    snippet_timeline = attach_snippet_timeline(video, enriched_snippets)
+    progress = calculate_video_progress(video_progress, total)
+    first_snippet = enriched_snippets[0] if total else None
     context = {
         'video': video,
         'enriched_snippets': enriched_snippets,
         'progress': progress,
         'total_snippets': total,
+        'snippet_timeline': snippet_timeline,
         'first_snippet': first_snippet,
     }
     return render(request, 'frontend/videos/detail.html', context) 
\ No newline at end of file
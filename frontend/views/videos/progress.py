@@ -0,0 +1,26 @@
+from django.shortcuts import get_object_or_404
+from django.http import JsonResponse
+from django.conf import settings
+from shared.models import Video
+from frontend.models import VideoProgress
+from frontend.interactors.calculate_video_progress import calculate_video_progress
+from frontend.interactors.video_progress_touches import touch_video_progress, get_buffered_video_touches
+
+def video_progress(request, youtube_id):
+    """The current user's progress on a video, as JSON, for the personal overlay on the cached share page"""
+    if not request.user.is_authenticated:
+        return JsonResponse({'progress': None})
+
+    # Get the current frontend language
+    language_code = getattr(settings, 'LANGUAGE_TO_LEARN', 'de')
+    frontend_value = language_code  # 'de' or 'ar'
+
+    video = get_object_or_404(Video, youtube_id=youtube_id, frontend=frontend_value)
+    progress = VideoProgress.objects.filter(user=request.user, video=video).first()
+    # the previous visit: a touch of this process that isn't flushed yet is newer than the stored one
+    last_practiced = get_buffered_video_touches(request.user).get(video.id) or (progress.last_practiced if progress else None)
+    touch_video_progress(request.user, video)
+    return JsonResponse({
+        'progress': calculate_video_progress(progress, video.snippets.count()),
+        'last_practiced': last_practiced.isoformat() if last_practiced else None,
+    })
@@ -1,37 +1,32 @@
 from django.shortcuts import render, get_object_or_404
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
 from shared.models import Video
-from guest_user.decorators import allow_guest_user
-from frontend.models import VideoProgress
-from django.utils import timezone
-from frontend.interactors.enrich_video_snippets_with_user_progress import enrich_video_snippets_with_user_progress
-from frontend.interactors.calculate_video_progress import calculate_video_progress
+from frontend.interactors.video_share_page_cache import get_cached_video_share_page, set_cached_video_share_page, SHARE_PAGE_LOCAL_TIMEOUT
 from django.conf import settings
 
-@allow_guest_user
+# The share page is what we post on social media, so it gets burst traffic from mostly new visitors.
+# It renders the same for everyone and is served from the page cache: a cache hit doesn't touch
+# request.user or the session, so it needs no db queries at all.
+# No guest user is created here; that happens on the first snippet page.
+# The user's own progress is loaded separately, see video_progress.
 def video_share(request, youtube_id):
     # Get the current frontend language
     language_code = getattr(settings, 'LANGUAGE_TO_LEARN', 'de')
     frontend_value = language_code  # 'de' or 'ar'
 
-    video = get_object_or_404(Video, youtube_id=youtube_id, frontend=frontend_value)
-    enriched_snippets = enrich_video_snippets_with_user_progress(video, request.user)
-    snippets = video.snippets.all().order_by('index')
-    total = snippets.count()
-    # Upsert VideoProgress for this user and video
-    if request.user.is_authenticated:
-        VideoProgress.objects.update_or_create(
-            user=request.user,
-            video=video,
-            defaults={"last_practiced": timezone.now()}
-        )
-    progress = calculate_video_progress(video, request.user)
-    first_snippet = snippets.first() if snippets else None
-    context = {
-        'video': video,
-        'enriched_snippets': enriched_snippets,
-        'progress': progress,
-        'total_snippets': total,
-        'first_snippet': first_snippet,
-        'is_share_view': True,  # Flag to indicate this is the share view
-    }
-    return render(request, 'frontend/videos/share.html', context)
+    content = get_cached_video_share_page(frontend_value, youtube_id)
+    if content is None:
+        video = get_object_or_404(Video, youtube_id=youtube_id, frontend=frontend_value)
+        first_snippet = video.snippets.first()
+        context = {
+            'video': video,
+            'first_snippet': first_snippet,
+            'is_share_view': True,  # Flag to indicate this is the share view
+            'messages': [],  # the cached page must not contain this visitor's flash messages
+        }
+        content = render(request, 'frontend/videos/share.html', context).content
+        set_cached_video_share_page(frontend_value, youtube_id, content)
+    response = HttpResponse(content)
+    patch_cache_control(response, public=True, max_age=SHARE_PAGE_LOCAL_TIMEOUT)
+    return response
@@ -0,0 +1,8 @@
+# Read by gunicorn from the working directory (Procfile: `gunicorn backend.wsgi`)
+
+
+def worker_exit(server, worker):
+    # write the buffered search counts and video progress touches before the worker goes away
+    # (restarts, max_requests recycling, scaling down), see frontend/interactors/periodic_flush.py
+    from frontend.interactors.periodic_flush import flush_all
+    flush_all()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='snippet_timeline',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
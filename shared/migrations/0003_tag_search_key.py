@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 08:37
+
+from django.db import migrations, models
+from shared.search_keys import normalize_search_text
+
+
+def backfill_tag_search_keys(apps, schema_editor):
+    Tag = apps.get_model('shared', 'Tag')
+    tags = list(Tag.objects.all())
+    for tag in tags:
+        tag.search_key = normalize_search_text(tag.name)[:200]
+    Tag.objects.bulk_update(tags, ['search_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0002_video_snippet_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='search_key',
+            field=models.CharField(blank=True, db_index=True, max_length=200),
+        ),
+        migrations.RunPython(backfill_tag_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0003_tag_search_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['frontend', 'status', '-added_at', 'id'], name='shared_vide_fronten_48ec11_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['frontend', 'status', 'youtube_id'], name='shared_vide_fronten_191b2e_idx'),
+        ),
+    ]
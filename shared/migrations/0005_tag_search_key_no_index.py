@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shared', '0004_video_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tag',
+            name='search_key',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+    ]
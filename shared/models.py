@@ -1,6 +1,7 @@
 from django.db import models
 import math
 from django.urls import reverse
+from shared.search_keys import normalize_search_text
 
 
 class TagType(models.TextChoices):
@@ -13,9 +14,19 @@ class TagType(models.TextChoices):
 class Tag(models.Model):
     name = models.CharField(max_length=100)
     type = models.CharField(max_length=100, choices=TagType.choices, default=TagType.UNKNOWN)
+    # normalized name (see shared.search_keys), set on save; the CMS tag prefix index (cms.views.tag_prefix_index)
+    # matches queries against it in memory, so it needs no db index
+    search_key = models.CharField(max_length=200, blank=True)
 
     unique_together = ('name', 'type')
 
+    def save(self, *args, **kwargs):
+        self.search_key = normalize_search_text(self.name)[:200]
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -52,6 +63,17 @@ class Video(models.Model):
 
     added_at = models.DateTimeField(auto_now_add=True)
 
+    # Layout of the snippet timeline on the video page, computed when snippets are generated:
+    # {'duration': <end of last snippet>, 'bars': [[left %, width %], ...]} in snippet order
+    snippet_timeline = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the learner video list and of the cms video list
+            models.Index(fields=['frontend', 'status', '-added_at', 'id']),
+            models.Index(fields=['frontend', 'status', 'youtube_id']),
+        ]
+
     def __str__(self):
         return f"{self.youtube_id}"
     
@@ -0,0 +1,73 @@
+import re
+import unicodedata
+
+# Normalization of searchable text, per Frontend, so that spelling variants end up as the same search key.
+# Applied when search keys are written (Tag.search_key, the video search documents) and to every query.
+# Each pipeline is a list of str -> str steps; every step is idempotent, so keys can be normalized again.
+
+# harakat, tanwin, shadda, sukun, dagger alef and Quranic annotation marks
+ARABIC_DIACRITICS = re.compile('[\u064B-\u065F\u0670\u06D6-\u06ED]')
+TATWEEL = '\u0640'
+ARABIC_LETTER_VARIANTS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',  # alef with hamza/madda/wasla -> alef
+    'ة': 'ه',  # ta marbuta -> ha
+    'ى': 'ي',  # alef maqsura -> ya
+    'ؤ': 'و', 'ئ': 'ي',  # hamza on waw/ya -> waw/ya
+})
+GERMAN_LETTER_VARIANTS = str.maketrans({
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss',
+})
+LATIN_COMBINING_MARKS = re.compile('[\u0300-\u036F]')
+
+
+def _unicode_compose(text):
+    return unicodedata.normalize('NFKC', text)
+
+
+def _casefold(text):
+    return text.casefold()
+
+
+def _strip_arabic_diacritics(text):
+    return ARABIC_DIACRITICS.sub('', text).replace(TATWEEL, '')
+
+
+def _unify_arabic_letters(text):
+    return text.translate(ARABIC_LETTER_VARIANTS)
+
+
+def _transliterate_umlauts(text):
+    # after casefold, so Ä/ä are already one form (and casefold turns ß into ss)
+    return text.translate(GERMAN_LETTER_VARIANTS)
+
+
+def _strip_latin_accents(text):
+    # é -> e etc.; umlauts are already transliterated at this point
+    return unicodedata.normalize('NFC', LATIN_COMBINING_MARKS.sub('', unicodedata.normalize('NFD', text)))
+
+
+def _collapse_whitespace(text):
+    return ' '.join(text.split())
+
+
+ARABIC_PIPELINE = [_unicode_compose, _casefold, _strip_arabic_diacritics, _unify_arabic_letters, _collapse_whitespace]
+GERMAN_PIPELINE = [_unicode_compose, _casefold, _transliterate_umlauts, _strip_latin_accents, _collapse_whitespace]
+# The Arabic and German steps only touch their own script, so text without a frontend (tags) gets both
+ALL_PIPELINE = [
+    _unicode_compose, _casefold,
+    _strip_arabic_diacritics, _unify_arabic_letters,
+    _transliterate_umlauts, _strip_latin_accents,
+    _collapse_whitespace,
+]
+
+SEARCH_KEY_PIPELINES = {
+    'ar': ARABIC_PIPELINE,
+    'de': GERMAN_PIPELINE,
+}
+
+
+def normalize_search_text(text:str, frontend:str|None=None) -> str:
+    """The search key of a text for the given Frontend value, or for all frontends if None"""
+    for step in SEARCH_KEY_PIPELINES.get(frontend, ALL_PIPELINE):
+        text = step(text)
+    return text
@@ -0,0 +1,73 @@
+from django.test import SimpleTestCase, TestCase
+from shared.models import Tag
+from shared.search_keys import normalize_search_text
+
+# (input, search key) per pipeline
+ARABIC_CASES = [
+    ('كِتَابٌ', 'كتاب'),  # harakat and tanwin
+    ('مُحَمَّد', 'محمد'),  # shadda
+    ('الرَّحْمٰن', 'الرحمن'),  # sukun and dagger alef
+    ('كتـــاب', 'كتاب'),  # tatweel
+    ('أحمد', 'احمد'),
+    ('إسلام', 'اسلام'),
+    ('آمن', 'امن'),
+    ('ٱلله', 'الله'),
+    ('مدرسة', 'مدرسه'),  # ta marbuta
+    ('مستشفى', 'مستشفي'),  # alef maqsura
+    ('مؤمن', 'مومن'),
+    ('قائد', 'قايد'),
+    ('ﻻ', 'لا'),  # presentation form, composed by NFKC
+    ('  السلام   عليكم \n', 'السلام عليكم'),
+    ('Café Über', 'café über'),  # Latin text only gets casefolded
+]
+GERMAN_CASES = [
+    ('Über', 'ueber'),
+    ('Äpfel und Öl', 'aepfel und oel'),
+    ('Straße', 'strasse'),
+    ('STRASSE', 'strasse'),
+    ('ẞ', 'ss'),  # capital sharp s
+    ('Café', 'cafe'),
+    ('naïve Crème brûlée', 'naive creme brulee'),
+    ('U\u0308ber', 'ueber'),  # decomposed umlaut, composed by NFKC
+    ('ﬁnden', 'finden'),  # ligature
+    ('  Guten\tMorgen  ', 'guten morgen'),
+    ('مدرسة', 'مدرسة'),  # Arabic text is left alone
+]
+# tags have no frontend: both scripts are normalized
+ALL_CASES = [
+    ('Über', 'ueber'),
+    ('Straße', 'strasse'),
+    ('Café', 'cafe'),
+    ('كِتَابٌ', 'كتاب'),
+    ('أحمد', 'احمد'),
+    ('مدرسة', 'مدرسه'),
+    ('  Müller   مُحَمَّد ', 'mueller محمد'),
+]
+
+
+class SearchKeyTests(SimpleTestCase):
+    def assert_search_keys(self, cases, frontend):
+        for text, key in cases:
+            with self.subTest(text=text):
+                self.assertEqual(normalize_search_text(text, frontend), key)
+                # keys can be normalized again
+                self.assertEqual(normalize_search_text(key, frontend), key)
+
+    def test_arabic(self):
+        self.assert_search_keys(ARABIC_CASES, 'ar')
+
+    def test_german(self):
+        self.assert_search_keys(GERMAN_CASES, 'de')
+
+    def test_all_frontends(self):
+        self.assert_search_keys(ALL_CASES, None)
+
+    def test_unknown_frontends_get_all_pipelines(self):
+        self.assert_search_keys(ALL_CASES, 'xx')
+
+
+class TagSearchKeyTests(TestCase):
+    def test_tags_are_keyed_for_all_frontends(self):
+        for name, key in ALL_CASES:
+            with self.subTest(name=name):
+                self.assertEqual(Tag.objects.create(name=name).search_key, key)